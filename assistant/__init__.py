@@ -0,0 +1,19 @@
+__all__ = [
+    "audio",
+    "backends",
+    "bench",
+    "cache",
+    "keywords",
+    "kws_eval",
+    "loadtest",
+    "memory",
+    "metrics",
+    "pipeline",
+    "playback",
+    "recognition",
+    "sentences",
+    "server",
+    "session_log",
+    "stubs",
+    "vad",
+]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import wave
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+
+SAMPLE_RATE = 16000
+CHUNK_FRAMES = 4000
+
+
+class AudioRingBuffer:
+    """Bounded FIFO of PCM chunks shared by the capture thread and the event loop.
+
+    The capture thread calls ``push``; coroutines on the loop await ``pop``.
+    When the consumer falls more than ``capacity`` chunks behind, the oldest
+    chunk is discarded and counted in ``dropped`` instead of stalling capture.
+    Sources that can be paused (file replay) pass ``block=True`` and wait for
+    room instead.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, capacity: int = 240):
+        self._loop = loop
+        self._capacity = capacity
+        self._chunks: Deque[bytes] = deque()
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+
+    def push(self, chunk: bytes, block: bool = False) -> None:
+        with self._lock:
+            while block and len(self._chunks) >= self._capacity and not self._closed:
+                self._space.wait(0.1)
+            if len(self._chunks) >= self._capacity:
+                self._chunks.popleft()
+                self.dropped += 1
+            self._chunks.append(chunk)
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._space.notify_all()
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._chunks)
+
+    async def pop(self) -> Optional[bytes]:
+        """Return the next chunk, or ``None`` once the buffer is closed and drained."""
+        while True:
+            with self._lock:
+                if self._chunks:
+                    self._space.notify()
+                    return self._chunks.popleft()
+                if self._closed:
+                    return None
+                self._ready.clear()
+            await self._ready.wait()
+
+
+class MicrophoneCapture:
+    """Reads a PyAudio input stream on a dedicated thread.
+
+    Audio sources share this interface: ``start(ring)`` begins pushing
+    16 kHz mono int16 chunks into the ring buffer from a thread, ``stop()``
+    ends it, and the ring is closed when the source runs out.
+
+    Capture never waits on recognition, the model or playback, so the input
+    device buffer is drained continuously and does not overflow.
+    """
+
+    def __init__(self, stream, chunk_frames: int = CHUNK_FRAMES):
+        self._stream = stream
+        self._chunk_frames = chunk_frames
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self, ring: AudioRingBuffer) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(ring,), name="mic-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _run(self, ring: AudioRingBuffer) -> None:
+        try:
+            while not self._stop.is_set():
+                ring.push(self._stream.read(self._chunk_frames, exception_on_overflow=False))
+        finally:
+            ring.close()
+
+
+class WavFileSource:
+    """Replays 16-bit mono 16 kHz WAV files as if they came from the microphone.
+
+    With ``realtime`` chunks are paced at the audio rate; otherwise they are
+    pushed as fast as the pipeline consumes them (never dropped). Each file is
+    followed by ``trailing_silence`` seconds of digital silence so the
+    endpointer can close the utterance. ``before_file(index)`` is called on
+    the source thread before file ``index`` and once more with
+    ``index == len(paths)`` before the ring is closed, which lets a harness
+    wait for the previous turn to finish.
+    """
+
+    def __init__(
+        self,
+        paths: List[str],
+        realtime: bool = False,
+        trailing_silence: float = 1.5,
+        chunk_frames: int = CHUNK_FRAMES,
+        before_file: Optional[Callable[[int], None]] = None,
+    ):
+        self.paths = list(paths)
+        self.realtime = realtime
+        self.trailing_silence = trailing_silence
+        self._chunk_frames = chunk_frames
+        self.before_file = before_file
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.audio_seconds = 0.0
+
+    def start(self, ring: AudioRingBuffer) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(ring,), name="wav-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    def _run(self, ring: AudioRingBuffer) -> None:
+        step = self._chunk_frames * 2
+        chunk_seconds = self._chunk_frames / float(SAMPLE_RATE)
+        silence = b"\x00\x00" * int(self.trailing_silence * SAMPLE_RATE)
+        try:
+            for index, path in enumerate(self.paths):
+                if self.before_file is not None:
+                    self.before_file(index)
+                pcm = read_wav(path) + silence
+                self.audio_seconds += len(pcm) / (2.0 * SAMPLE_RATE)
+                started = time.monotonic()
+                for n, offset in enumerate(range(0, len(pcm), step)):
+                    if self._stop.is_set():
+                        return
+                    if self.realtime:
+                        delay = started + n * chunk_seconds - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                    ring.push(pcm[offset:offset + step], block=not self.realtime)
+            if self.before_file is not None:
+                self.before_file(len(self.paths))
+        finally:
+            ring.close()
+
+
+def read_wav(path: str, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """PCM frames of a 16-bit mono WAV recorded at ``sample_rate``."""
+    with wave.open(path, "rb") as wav:
+        if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (sample_rate, 1, 2):
+            raise ValueError(
+                f"{path}: expected 16-bit mono {sample_rate} Hz, got "
+                f"{wav.getsampwidth() * 8}-bit {wav.getnchannels()}ch {wav.getframerate()} Hz"
+            )
+        return wav.readframes(wav.getnframes())
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Tuple
+
+
+DEFAULT_MODEL = "Qwen/Qwen2.5-72B-Instruct"
+
+FIRST_TURN_TEMPLATE = """Generate a response that
+avoids using the characters '#' and '*'.
+The content should be clear and informative
+without including these symbols. 
+Question: {question}"""
+
+
+def build_prompt(question: str, turn: int, memory: Any = None) -> List[Dict[str, str]]:
+    """Request messages for ``question``.
+
+    With a ``ConversationMemory`` the instructions go in a system message and
+    the budgeted history is included; without one, the formatting
+    instructions are sent on the first turn only.
+    """
+    if memory is not None:
+        return memory.messages_for(question)
+    content = FIRST_TURN_TEMPLATE.format(question=question) if turn == 1 else question
+    return [{"role": "user", "content": content}]
+
+
+class ChatBackend(Protocol):
+    """What the pipeline and ``ConversationMemory`` need from an LLM."""
+
+    async def complete(self, messages: List[Dict[str, str]]) -> str: ...
+
+    def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]: ...
+
+
+class LLMRequestError(RuntimeError):
+    """A chat request failed; ``status`` is the HTTP status, None for transport errors and timeouts."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status in (408, 409, 429) or self.status >= 500
+
+
+class HTTPChat:
+    """OpenAI-compatible ``/chat/completions`` over a pooled ``httpx.AsyncClient``.
+
+    The client keeps up to ``max_connections`` keep-alive connections open,
+    so consecutive turns skip the TCP/TLS handshake. ``timeout`` bounds every
+    read (including the gap between streamed chunks) and ``connect_timeout``
+    the connection setup; both surface as a retryable ``LLMRequestError``.
+    Streaming runs on the event loop, and closing the generator on barge-in
+    closes the response.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = "",
+        model: str = DEFAULT_MODEL,
+        temperature: float = 0.5,
+        max_tokens: int = 1024,
+        top_p: float = 0.7,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 4,
+    ):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.api_key = api_key
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.top_p = top_p
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self._client: Any = None
+
+    def _http(self) -> Any:
+        if self._client is None:
+            import httpx
+
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._client
+
+    def _body(self, messages: List[Dict[str, str]], stream: bool) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "top_p": self.top_p,
+            "stream": stream,
+        }
+
+    async def complete(self, messages: List[Dict[str, str]]) -> str:
+        import httpx
+
+        try:
+            response = await self._http().post("chat/completions", json=self._body(messages, False))
+        except httpx.HTTPError as e:
+            raise LLMRequestError(f"{type(e).__name__}: {e}") from e
+        if response.status_code >= 400:
+            raise LLMRequestError(f"HTTP {response.status_code}: {response.text[:200]}", response.status_code)
+        return response.json()["choices"][0]["message"]["content"] or ""
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Yield content deltas from the server-sent event stream."""
+        import httpx
+
+        try:
+            async with self._http().stream("POST", "chat/completions", json=self._body(messages, True)) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise LLMRequestError(f"HTTP {response.status_code}: {response.text[:200]}", response.status_code)
+                done = False
+                async for line in response.aiter_lines():
+                    # Read on to the end of the body after [DONE]: a response left
+                    # half-read is closed instead of going back to the pool
+                    if done or not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        done = True
+                        continue
+                    choices = json.loads(data).get("choices") or []
+                    delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+        except httpx.HTTPError as e:
+            raise LLMRequestError(f"{type(e).__name__}: {e}") from e
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class ResilientChat:
+    """Retries and hedging in front of one or two ``ChatBackend`` endpoints.
+
+    A request that fails before its first delta is retried up to ``retries``
+    times, sleeping a full-jitter exponential backoff (uniform in
+    ``[0, min(max_backoff, backoff * 2**attempt)]``) between attempts;
+    errors with ``retryable`` False (e.g. HTTP 400/401) are raised at once.
+    With a ``secondary`` endpoint, a request whose first delta has not
+    arrived after ``hedge_after`` seconds is sent there as well, and
+    whichever stream starts first is used while the other is closed; a
+    primary that fails outright falls over to the secondary immediately.
+    Once deltas have been passed on a failure is not retried, since the
+    sentences may already be playing.
+    """
+
+    def __init__(
+        self,
+        primary: Any,
+        secondary: Any = None,
+        retries: int = 2,
+        backoff: float = 0.25,
+        max_backoff: float = 2.0,
+        hedge_after: Optional[float] = 1.5,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.retried = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+
+    async def complete(self, messages: List[Dict[str, str]]) -> str:
+        return "".join([delta async for delta in self.stream(messages)])
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        attempt = 0
+        while True:
+            try:
+                source, first = await self._open(messages)
+                break
+            except Exception as e:
+                if attempt >= self.retries or not getattr(e, "retryable", True):
+                    raise
+                delay = random.uniform(0.0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                attempt += 1
+                self.retried += 1
+                await asyncio.sleep(delay)
+        try:
+            if first is not None:
+                yield first
+            async for delta in source:
+                yield delta
+        finally:
+            await source.aclose()
+
+    async def _open(self, messages: List[Dict[str, str]]) -> Tuple[Any, Optional[str]]:
+        """Start the request; return the winning stream and its first delta."""
+        primary = asyncio.ensure_future(_first_delta(self.primary, messages))
+        pending = {primary}
+        hedged = self.secondary is None
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                timeout = None if hedged else self.hedge_after
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is not None:
+                    for t in done - {winner}:
+                        if t.exception() is None:
+                            await t.result()[0].aclose()
+                    if winner is not primary:
+                        self.secondary_wins += 1
+                    return winner.result()
+                for t in done:
+                    error = t.exception()
+                if not hedged and (not done or not pending):
+                    # Slow (or failed) primary: race the same request on the secondary
+                    hedged = True
+                    self.hedged += 1
+                    pending.add(asyncio.ensure_future(_first_delta(self.secondary, messages)))
+            assert error is not None
+            raise error
+        finally:
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _first_delta(backend: Any, messages: List[Dict[str, str]]) -> Tuple[Any, Optional[str]]:
+    source = backend.stream(messages).__aiter__()
+    try:
+        return source, await source.__anext__()
+    except StopAsyncIteration:
+        return source, None
+    except BaseException:
+        await source.aclose()
+        raise
+
+
+class EdgeTTS:
+    """edge-tts synthesis collected in memory (24 kHz mono MP3)."""
+
+    def __init__(self, voice: str):
+        self.voice = voice
+
+    async def synthesize(self, text: str) -> bytes:
+        import edge_tts
+
+        communicate = edge_tts.Communicate(text, self.voice)
+        audio = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio += chunk["data"]
+        return bytes(audio)
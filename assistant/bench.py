@@ -0,0 +1,201 @@
+"""Replay a directory of recorded questions through the assistant pipeline.
+
+Usage::
+
+    python -m assistant.bench --model PATH questions/ [--realtime] [--json report.json]
+
+Every ``*.wav`` in the directory (16-bit mono 16 kHz) is one question. The
+files are fed through the same VAD, recognizer, LLM, TTS and playback
+stages as the live assistant, but with a WAV replay source, the stub LLM
+and TTS backends and a null audio output, so it runs headless with no
+microphone, speakers or network. Each question starts once the previous
+answer has finished playing.
+
+Reported:
+
+- recognition throughput: audio seconds decoded per second spent inside
+  the recognizer (x real-time), and the share of audio the VAD skipped
+- end-of-utterance latency: speech end -> final transcript (p50/p95)
+- end-to-end latency: speech end -> first answer audio, and the full turn
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .audio import SAMPLE_RATE, WavFileSource
+from .keywords import keyword_grammar
+from .metrics import MetricsRecorder
+from .pipeline import VoiceAssistant
+from .session_log import SessionLogger
+from .playback import AudioPlayer, NullOutput
+from .stubs import StubLLM, StubTTS
+
+
+class TimedRecognizer:
+    """Wraps a Vosk recognizer and accumulates time spent in decoding calls."""
+
+    def __init__(self, inner: Any):
+        self.inner = inner
+        self.seconds = 0.0
+        self.audio_bytes = 0
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+    def AcceptWaveform(self, data: bytes) -> bool:
+        self.audio_bytes += len(data)
+        return self._timed(self.inner.AcceptWaveform, data)
+
+    def Result(self) -> str:
+        return self._timed(self.inner.Result)
+
+    def PartialResult(self) -> str:
+        return self._timed(self.inner.PartialResult)
+
+    def FinalResult(self) -> str:
+        return self._timed(self.inner.FinalResult)
+
+    def Reset(self) -> None:
+        self.inner.Reset()
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.audio_bytes / (2.0 * SAMPLE_RATE)
+
+
+async def run_benchmark(
+    files: List[str],
+    recognizer: Any,
+    spotter: Any = None,
+    llm: Any = None,
+    tts: Any = None,
+    realtime: bool = False,
+    metrics_path: Optional[str] = None,
+    turn_timeout: float = 60.0,
+) -> Dict[str, Any]:
+    """Replay ``files`` through one ``VoiceAssistant`` and return the report.
+
+    The same assistant (and recognizer) handles every file, as in a live
+    session; each file is released only once the previous answer has
+    finished playing, so every recording is a separate turn.
+    """
+    loop = asyncio.get_running_loop()
+    rec = TimedRecognizer(recognizer)
+    spot = TimedRecognizer(spotter) if spotter is not None else None
+    metrics = MetricsRecorder(summary_every=0)
+    session_log = SessionLogger(metrics_path) if metrics_path else None
+
+    async def prepare(index: int) -> None:
+        deadline = time.monotonic() + turn_timeout
+        while not assistant.idle and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        if index < len(files) and spot is None:
+            # No wake word in the recordings: arm the assistant directly
+            assistant.wake(announce=False)
+
+    def before_file(index: int) -> None:
+        asyncio.run_coroutine_threadsafe(prepare(index), loop).result()
+
+    source = WavFileSource(files, realtime=realtime, before_file=before_file)
+    assistant = VoiceAssistant(
+        recognizer=rec,
+        capture=source,
+        llm=llm or StubLLM(),
+        tts=tts or StubTTS(),
+        player=AudioPlayer(NullOutput(realtime=realtime)),
+        earcon=None,
+        spotter=spot,
+        metrics=metrics,
+        session_log=session_log,
+    )
+    started = time.perf_counter()
+    try:
+        await assistant.run()
+    finally:
+        if session_log is not None:
+            await asyncio.to_thread(session_log.close)
+    wall = time.perf_counter() - started
+
+    decoders = [r for r in (rec, spot) if r is not None]
+    decoded_audio = sum(r.audio_seconds for r in decoders)
+    decode_seconds = sum(r.seconds for r in decoders)
+    summary = metrics.summary()
+
+    def stage(name: str) -> Dict[str, float]:
+        return summary.get(name, {"count": 0, "p50": float("nan"), "p95": float("nan")})
+
+    return {
+        "files": len(files),
+        "turns_completed": metrics.finished,
+        "turns_interrupted": metrics.interrupted,
+        "turns_failed": metrics.failed,
+        "audio_seconds": round(source.audio_seconds, 2),
+        "wall_seconds": round(wall, 2),
+        "pipeline_speed_x_realtime": round(source.audio_seconds / wall, 2) if wall else None,
+        "decoded_audio_seconds": round(decoded_audio, 2),
+        "vad_skipped_fraction": round(1.0 - decoded_audio / source.audio_seconds, 3) if source.audio_seconds else None,
+        "decode_seconds": round(decode_seconds, 3),
+        "recognition_x_realtime": round(decoded_audio / decode_seconds, 1) if decode_seconds else None,
+        "end_of_utterance_ms": stage("endpointing"),
+        "time_to_first_audio_ms": stage("time_to_first_audio"),
+        "turn_ms": stage("turn"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the voice assistant pipeline on recorded questions.")
+    parser.add_argument("questions", help="Directory of 16-bit mono 16 kHz WAV questions")
+    parser.add_argument("--model", required=True, help="Path to the Vosk model directory")
+    parser.add_argument("--realtime", action="store_true", help="Pace input and playback in real time instead of as fast as possible")
+    parser.add_argument("--wake-word", help="Recordings start with this wake word; use the keyword spotter to detect it")
+    parser.add_argument("--llm-first-token", type=float, default=0.3, help="Stub LLM time to first token (s)")
+    parser.add_argument("--llm-token-delay", type=float, default=0.02, help="Stub LLM delay between tokens (s)")
+    parser.add_argument("--tts-delay", type=float, default=0.05, help="Stub TTS synthesis time per sentence (s)")
+    parser.add_argument("--metrics-file", help="Also write each turn with its latency spans as JSONL")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    files = sorted(os.path.join(args.questions, n) for n in os.listdir(args.questions) if n.lower().endswith(".wav"))
+    if not files:
+        parser.error(f"no .wav files in {args.questions}")
+
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+
+    SetLogLevel(-1)
+    model = Model(args.model)
+    recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+    spotter = KaldiRecognizer(model, SAMPLE_RATE, keyword_grammar([args.wake_word])) if args.wake_word else None
+    report = asyncio.run(
+        run_benchmark(
+            files,
+            recognizer,
+            spotter=spotter,
+            llm=StubLLM(first_token_delay=args.llm_first_token, token_delay=args.llm_token_delay),
+            tts=StubTTS(synth_delay=args.tts_delay),
+            realtime=args.realtime,
+            metrics_path=args.metrics_file,
+        )
+    )
+
+    print(f"questions            {report['files']} ({report['turns_completed']} answered, {report['turns_interrupted']} interrupted, {report['turns_failed']} failed)")
+    print(f"audio / wall         {report['audio_seconds']:.1f}s / {report['wall_seconds']:.1f}s ({report['pipeline_speed_x_realtime']}x real-time)")
+    print(f"recognition          {report['recognition_x_realtime']}x real-time, VAD skipped {report['vad_skipped_fraction']:.0%} of audio")
+    for key, label in (("end_of_utterance_ms", "end of utterance"), ("time_to_first_audio_ms", "speech end -> audio"), ("turn_ms", "full turn")):
+        st = report[key]
+        print(f"{label:<20} p50 {st['p50']:>7.0f} ms   p95 {st['p95']:>7.0f} ms")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Set
+
+
+FILLER_WORDS = {"um", "uh", "er", "erm", "hmm", "please", "okay", "ok", "so", "well"}
+# Words a fuzzy match may add, drop or reorder; everything else must be identical
+FUNCTION_WORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "am", "do", "does", "did",
+    "to", "of", "for", "in", "on", "me", "you", "i", "can", "could", "would", "will", "just",
+}
+NEGATION_WORDS = {"not", "no", "never", "nor", "none", "nothing", "cannot", "without"}
+# Words that point back at the conversation ("what does it mean", "give me another example")
+CONTEXT_WORDS = {
+    "it", "its", "this", "that", "these", "those", "they", "them", "their", "he", "him", "his", "she", "her",
+    "another", "again", "more", "else", "other", "same", "previous", "last", "instead", "also", "too",
+    "example", "examples",
+}
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase, drop punctuation and filler words, collapse whitespace."""
+    return " ".join(w for w in WORD_RE.findall(text.lower()) if w not in FILLER_WORDS)
+
+
+def token_set_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Dice coefficient of two token sets: 1.0 for the same words in any order."""
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+def depends_on_context(question: str) -> bool:
+    """Whether ``question`` likely refers to earlier turns rather than standing on its own.
+
+    Deliberately eager: a self-contained question flagged here only misses
+    the cache, while a follow-up answered from it would be wrong.
+    """
+    words = normalize_question(question).split()
+    return not words or any(w in CONTEXT_WORDS for w in words)
+
+
+def is_negation(token: str) -> bool:
+    return token in NEGATION_WORDS or token.endswith("n't")
+
+
+def same_meaning_words(a: FrozenSet[str], b: FrozenSet[str]) -> bool:
+    """True when ``a`` and ``b`` differ only in function words.
+
+    Negations always count: "what is not a noun" never matches "what is a
+    noun", however similar the rest of the question is.
+    """
+    diff = a ^ b
+    return all(tok in FUNCTION_WORDS and not is_negation(tok) for tok in diff)
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    question: str
+    answer: str
+    sentences: List[str]
+    created: float
+    clip_sizes: List[int] = field(default_factory=list)
+    clips: Optional[List[bytes]] = None  # encoded TTS audio per sentence; None until loaded from disk
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        return frozenset(self.key.split())
+
+    @property
+    def audio_bytes(self) -> int:
+        return sum(self.clip_sizes)
+
+
+class ResponseCache:
+    """LRU + TTL cache of answers and their synthesized audio, keyed by question.
+
+    Lookups try the normalized question first, then the most similar cached
+    question by token-set similarity (candidates come from an inverted word
+    index, so a lookup never scans the whole cache). A fuzzy match may only
+    differ in function words such as articles and auxiliaries; every content
+    word and negation must be the same. With ``directory`` set,
+    entries persist across runs as ``<digest>.json`` metadata plus a
+    ``<digest>.audio`` blob that is read only on a hit.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_entries: int = 500,
+        max_audio_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        min_similarity: float = 0.85,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_audio_bytes = max_audio_bytes
+        self.ttl_seconds = ttl_seconds
+        self.min_similarity = min_similarity
+        self.clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._index: Dict[str, Set[str]] = defaultdict(set)
+        self._audio_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- lookup -------------------------------------------------------------
+
+    def lookup(self, question: str) -> Optional[CacheEntry]:
+        key = normalize_question(question)
+        if not key:
+            return None
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key) or self._closest(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry.key)
+            if entry.clips is None:
+                entry.clips = self._read_clips(entry)
+                if entry.clips is None:
+                    self._drop(entry.key)
+                    self.misses += 1
+                    return None
+            self.hits += 1
+            return entry
+
+    def _closest(self, key: str) -> Optional[CacheEntry]:
+        tokens = frozenset(key.split())
+        candidates: Set[str] = set()
+        for tok in tokens:
+            candidates |= self._index.get(tok, set())
+        best, best_score = None, self.min_similarity
+        for cand in candidates:
+            cand_tokens = self._entries[cand].tokens
+            if not same_meaning_words(tokens, cand_tokens):
+                continue
+            score = token_set_similarity(tokens, cand_tokens)
+            if score >= best_score:
+                best, best_score = self._entries[cand], score
+        return best
+
+    # -- store --------------------------------------------------------------
+
+    def store(self, question: str, answer: str, sentences: List[str], clips: List[bytes]) -> None:
+        key = normalize_question(question)
+        if not key or len(sentences) != len(clips):
+            return
+        entry = CacheEntry(key, question, answer, list(sentences), self.clock(), [len(c) for c in clips], list(clips))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            for tok in entry.tokens:
+                self._index[tok].add(key)
+            self._audio_bytes += entry.audio_bytes
+            self._write(entry)
+            while self._entries and (len(self._entries) > self.max_entries or self._audio_bytes > self.max_audio_bytes):
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    # -- internals ----------------------------------------------------------
+
+    def _expire(self) -> None:
+        cutoff = self.clock() - self.ttl_seconds
+        stale = [k for k, e in self._entries.items() if e.created < cutoff]
+        for key in stale:
+            self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tok in entry.tokens:
+            keys = self._index.get(tok)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[tok]
+        self._audio_bytes -= entry.audio_bytes
+        if self.directory:
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _paths(self, key: str) -> List[str]:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory or "", digest)
+        return [base + ".json", base + ".audio"]
+
+    def _write(self, entry: CacheEntry) -> None:
+        if not self.directory:
+            return
+        meta_path, audio_path = self._paths(entry.key)
+        with open(audio_path, "wb") as f:
+            for clip in entry.clips or []:
+                f.write(clip)
+        meta = {
+            "key": entry.key,
+            "question": entry.question,
+            "answer": entry.answer,
+            "sentences": entry.sentences,
+            "created": entry.created,
+            "clip_sizes": entry.clip_sizes,
+        }
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def _read_clips(self, entry: CacheEntry) -> Optional[List[bytes]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._paths(entry.key)[1], "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        if len(blob) != entry.audio_bytes:
+            return None
+        clips: List[bytes] = []
+        offset = 0
+        for size in entry.clip_sizes:
+            clips.append(blob[offset:offset + size])
+            offset += size
+        return clips
+
+    def _load_index(self) -> None:
+        metas: List[CacheEntry] = []
+        for name in os.listdir(self.directory or ""):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory or "", name), "r", encoding="utf-8") as f:
+                    m = json.load(f)
+                metas.append(CacheEntry(m["key"], m["question"], m["answer"], m["sentences"], float(m["created"]), list(m["clip_sizes"])))
+            except (OSError, ValueError, KeyError):
+                continue
+        # Oldest first, so LRU order after a restart follows creation time
+        for entry in sorted(metas, key=lambda e: e.created):
+            self._entries[entry.key] = entry
+            for tok in entry.tokens:
+                self._index[tok].add(entry.key)
+            self._audio_bytes += entry.audio_bytes
+        with self._lock:
+            self._expire()
+            while self._entries and (len(self._entries) > self.max_entries or self._audio_bytes > self.max_audio_bytes):
+                self._drop(next(iter(self._entries)))
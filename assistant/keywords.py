@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from typing import Iterable
+
+
+UNKNOWN_WORD = "[unk]"
+
+
+def keyword_grammar(keywords: Iterable[str]) -> str:
+    """Vosk grammar for a keyword-spotting recognizer.
+
+    ``[unk]`` absorbs every other word, so "restart" or "weekend" decode as
+    unknown instead of being forced onto the nearest keyword.
+    """
+    phrases = sorted({k.strip().lower() for k in keywords if k.strip()})
+    return json.dumps(phrases + [UNKNOWN_WORD])
+
+
+def find_keyword(text: str, keyword: str) -> int:
+    """Word index where ``keyword`` starts in ``text`` as whole words, or -1."""
+    words = text.lower().split()
+    target = keyword.lower().split()
+    if not target:
+        return -1
+    for i in range(len(words) - len(target) + 1):
+        if words[i:i + len(target)] == target:
+            return i
+    return -1
+
+
+def has_keyword(text: str, keyword: str) -> bool:
+    return find_keyword(text, keyword) >= 0
+
+
+def text_after_keyword(text: str, keyword: str) -> str:
+    idx = find_keyword(text, keyword)
+    if idx < 0:
+        return text
+    return " ".join(text.split()[idx + len(keyword.split()):])
+
+
+def is_keyword(text: str, keyword: str) -> bool:
+    """``text`` is exactly ``keyword``, nothing else."""
+    target = keyword.lower().split()
+    return bool(target) and text.lower().split() == target
+
+
+def ends_with_keyword(text: str, keyword: str) -> bool:
+    words = text.lower().split()
+    target = keyword.lower().split()
+    return bool(target) and words[-len(target):] == target
+
+
+def strip_trailing_keyword(text: str, keyword: str) -> str:
+    """``text`` without ``keyword`` as its last word(s).
+
+    Only a trailing keyword ends the question; anywhere else ("how does the
+    story end") it is part of what was asked.
+    """
+    if not ends_with_keyword(text, keyword):
+        return text
+    return " ".join(text.split()[:-len(keyword.split())])
@@ -0,0 +1,142 @@
+"""Replay recorded audio through the wake-word detectors and compare them.
+
+Usage::
+
+    python -m assistant.kws_eval --model PATH --positive wake_wavs/ --negative chatter_wavs/
+
+``--positive`` recordings each contain the start keyword at least once;
+``--negative`` recordings contain none (ordinary speech, "restart",
+"weekend", TV audio, ...). All files must be 16-bit mono 16 kHz WAV. Each
+detector sees the same VAD-gated chunks the live pipeline would, and the
+report gives detection rate, false triggers per hour of audio and CPU time
+as a fraction of audio duration.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from .audio import CHUNK_FRAMES, SAMPLE_RATE, read_wav
+from .keywords import has_keyword, keyword_grammar
+from .recognition import recognize_chunk
+from .vad import Endpointer
+
+
+@dataclass
+class DetectorStats:
+    name: str
+    files: int = 0
+    files_triggered: int = 0
+    triggers: int = 0
+    audio_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    per_file: Dict[str, int] = field(default_factory=dict)
+
+
+def _wav_files(directory: str) -> List[str]:
+    return sorted(os.path.join(directory, n) for n in os.listdir(directory) if n.lower().endswith(".wav"))
+
+
+def count_triggers(recognizer: Any, pcm: bytes, matches: Callable[[Dict[str, Any], bool], bool], use_vad: bool = True) -> int:
+    """Number of utterances in ``pcm`` on which ``matches`` fires at least once."""
+    endpointer = Endpointer() if use_vad else None
+    step = CHUNK_FRAMES * 2
+    triggers = 0
+    fired = False
+    for offset in range(0, len(pcm), step):
+        chunk = pcm[offset:offset + step]
+        last = offset + step >= len(pcm)
+        if endpointer is not None:
+            segment = endpointer.process(chunk)
+            if not segment.in_speech and not last:
+                continue
+            audio, ended = segment.audio, segment.ended or last
+        else:
+            audio, ended = chunk, last
+        result = recognize_chunk(recognizer, audio, ended)
+        if not fired and matches(result, ended):
+            triggers += 1
+            fired = True
+        if ended or "text" in result:
+            fired = False
+    return triggers
+
+
+def evaluate(model_path: str, keyword: str, keywords: List[str], files: List[str], use_vad: bool = True) -> List[DetectorStats]:
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+
+    SetLogLevel(-1)
+    model = Model(model_path)
+    detectors = {
+        # The old behaviour: full vocabulary, substring match on final text
+        "full-substring": (
+            lambda: KaldiRecognizer(model, SAMPLE_RATE),
+            lambda r, ended: keyword in r.get("text", ""),
+        ),
+        "full-word": (
+            lambda: KaldiRecognizer(model, SAMPLE_RATE),
+            lambda r, ended: has_keyword(r.get("text", ""), keyword),
+        ),
+        # What the pipeline runs while idle: keyword grammar, partials included
+        "grammar": (
+            lambda: KaldiRecognizer(model, SAMPLE_RATE, keyword_grammar(keywords)),
+            lambda r, ended: has_keyword(r.get("text") or r.get("partial") or "", keyword),
+        ),
+    }
+    report: List[DetectorStats] = []
+    for name, (factory, matches) in detectors.items():
+        stats = DetectorStats(name)
+        for path in files:
+            pcm = read_wav(path)
+            recognizer = factory()
+            cpu_start = time.process_time()
+            n = count_triggers(recognizer, pcm, matches, use_vad=use_vad)
+            stats.cpu_seconds += time.process_time() - cpu_start
+            stats.audio_seconds += len(pcm) / (2.0 * SAMPLE_RATE)
+            stats.files += 1
+            stats.files_triggered += 1 if n else 0
+            stats.triggers += n
+            stats.per_file[os.path.basename(path)] = n
+        report.append(stats)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure wake-word false triggers and CPU use on recorded audio.")
+    parser.add_argument("--model", required=True, help="Path to the Vosk model directory")
+    parser.add_argument("--keywords", nargs="+", default=["start", "end"], help="Grammar keywords; the first is the wake word")
+    parser.add_argument("--positive", help="Directory of WAVs that contain the wake word")
+    parser.add_argument("--negative", help="Directory of WAVs that do not contain the wake word")
+    parser.add_argument("--no-vad", action="store_true", help="Decode every chunk instead of VAD-gated speech only")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report as JSON")
+    args = parser.parse_args()
+    if not args.positive and not args.negative:
+        parser.error("give --positive and/or --negative")
+
+    wake = args.keywords[0]
+    output: Dict[str, Any] = {}
+    for label, directory in (("positive", args.positive), ("negative", args.negative)):
+        if not directory:
+            continue
+        files = _wav_files(directory)
+        report = evaluate(args.model, wake, args.keywords, files, use_vad=not args.no_vad)
+        print(f"\n{label}: {len(files)} files from {directory}")
+        print(f"{'detector':<16}{'hit rate':>10}{'triggers':>10}{'per hour':>10}{'cpu/audio':>11}")
+        for st in report:
+            hours = max(st.audio_seconds / 3600.0, 1e-9)
+            print(
+                f"{st.name:<16}{st.files_triggered / max(1, st.files):>10.1%}{st.triggers:>10}"
+                f"{st.triggers / hours:>10.1f}{st.cpu_seconds / max(st.audio_seconds, 1e-9):>11.3f}"
+            )
+        output[label] = [st.__dict__ for st in report]
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
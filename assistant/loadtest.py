@@ -0,0 +1,131 @@
+"""Load-test the recognition server with concurrent replayed sessions.
+
+Usage::
+
+    python -m assistant.loadtest questions/ --sessions 8 [--port 2700] [--realtime] [--rounds 2]
+
+Each session opens its own connection and streams every ``*.wav`` in the
+directory (16-bit mono 16 kHz) as one utterance, followed by an
+end-of-utterance frame. Reported: aggregate throughput (audio seconds
+streamed per wall-clock second, i.e. how many real-time microphones the
+server kept up with) and finalisation latency, from the end-of-utterance
+frame being sent to the final transcript arriving, as p50/p95/max.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+from .audio import CHUNK_FRAMES, SAMPLE_RATE, read_wav
+from .metrics import percentile
+from .server import FRAME_HEADER
+
+
+async def run_session(host: str, port: int, utterances: List[bytes], rounds: int = 1, realtime: bool = False) -> Dict[str, Any]:
+    """Stream the utterances over one connection; return latencies and transcripts."""
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at: Deque[float] = deque()
+    latencies: List[float] = []
+    transcripts: List[str] = []
+    audio_seconds = 0.0
+
+    async def receive() -> None:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            reply = json.loads(line)
+            if "error" in reply:
+                raise ConnectionError(reply["error"])
+            if reply.get("flush"):
+                latencies.append((time.monotonic() - sent_at.popleft()) * 1000.0)
+                transcripts.append(reply["text"])
+
+    receiver = asyncio.create_task(receive())
+    step = CHUNK_FRAMES * 2
+    try:
+        for _ in range(rounds):
+            for pcm in utterances:
+                started = time.monotonic()
+                for offset in range(0, len(pcm), step):
+                    chunk = pcm[offset:offset + step]
+                    writer.write(FRAME_HEADER.pack(len(chunk)) + chunk)
+                    # drain() is where server backpressure shows up
+                    await writer.drain()
+                    if realtime:
+                        await asyncio.sleep(max(0.0, started + (offset + len(chunk)) / (2.0 * SAMPLE_RATE) - time.monotonic()))
+                sent_at.append(time.monotonic())
+                writer.write(FRAME_HEADER.pack(0))
+                await writer.drain()
+                audio_seconds += len(pcm) / (2.0 * SAMPLE_RATE)
+        writer.write_eof()
+        await receiver
+    finally:
+        receiver.cancel()
+        writer.close()
+    return {"latencies_ms": latencies, "transcripts": transcripts, "audio_seconds": audio_seconds}
+
+
+async def run_load(host: str, port: int, utterances: List[bytes], sessions: int, rounds: int = 1, realtime: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_session(host, port, utterances, rounds, realtime) for _ in range(sessions)),
+        return_exceptions=True,
+    )
+    wall = time.perf_counter() - started
+    ok = [r for r in results if not isinstance(r, BaseException)]
+    errors = [repr(r) for r in results if isinstance(r, BaseException)]
+    latencies = [v for r in ok for v in r["latencies_ms"]]
+    audio = sum(r["audio_seconds"] for r in ok)
+    return {
+        "sessions": sessions,
+        "failed_sessions": len(errors),
+        "errors": errors[:5],
+        "utterances": len(latencies),
+        "audio_seconds": round(audio, 2),
+        "wall_seconds": round(wall, 2),
+        "throughput_x_realtime": round(audio / wall, 2) if wall else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "max": round(max(latencies), 1) if latencies else float("nan"),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay WAV questions from N concurrent sessions against the recognition server.")
+    parser.add_argument("questions", help="Directory of 16-bit mono 16 kHz WAV files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2700)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=1, help="Times each session replays the directory")
+    parser.add_argument("--realtime", action="store_true", help="Pace each session like a live microphone")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    files = sorted(os.path.join(args.questions, n) for n in os.listdir(args.questions) if n.lower().endswith(".wav"))
+    if not files:
+        parser.error(f"no .wav files in {args.questions}")
+    utterances = [read_wav(f) for f in files]
+    report = asyncio.run(run_load(args.host, args.port, utterances, args.sessions, args.rounds, args.realtime))
+
+    print(f"sessions      {report['sessions']} ({report['failed_sessions']} failed)")
+    print(f"utterances    {report['utterances']}")
+    print(f"audio / wall  {report['audio_seconds']:.1f}s / {report['wall_seconds']:.1f}s ({report['throughput_x_realtime']}x real-time)")
+    lat = report["latency_ms"]
+    print(f"final result  p50 {lat['p50']:.0f} ms   p95 {lat['p95']:.0f} ms   max {lat['max']:.0f} ms")
+    for error in report["errors"]:
+        print(f"error: {error}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
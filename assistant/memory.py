@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+
+SYSTEM_INSTRUCTIONS = (
+    "You are a friendly English conversation partner. Keep answers clear and informative, "
+    "and never use the characters '#' and '*'."
+)
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a learner and an English tutor.
+Keep names, facts, goals and open questions; drop small talk. Reply with the summary only, at most {words} words.
+
+Current summary:
+{summary}
+
+New exchanges:
+{exchanges}"""
+
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English), never below the word count."""
+    if not text:
+        return 0
+    return max(len(text.split()), math.ceil(len(text) / 4))
+
+
+class ConversationMemory:
+    """Conversation context kept within a fixed token budget per request.
+
+    The last ``keep_recent_turns`` exchanges are sent verbatim; older ones are
+    folded into a running summary by ``summarizer`` (any backend with an async
+    ``complete(messages)``) after the answer has been spoken, so summarising
+    never sits on the path to the first token. ``messages_for`` then fills
+    the budget newest-first, so request size stays flat however long the
+    session runs.
+    """
+
+    def __init__(
+        self,
+        summarizer: Any = None,
+        budget_tokens: int = 1200,
+        keep_recent_turns: int = 4,
+        summary_words: int = 120,
+        system_instructions: str = SYSTEM_INSTRUCTIONS,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ):
+        self.summarizer = summarizer
+        self.budget_tokens = budget_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.summary_words = summary_words
+        self.system_instructions = system_instructions
+        self.count_tokens = count_tokens
+        self.summary = ""
+        self.turns: Deque[Tuple[str, str]] = deque()
+        self._lock = asyncio.Lock()
+        self._cleared = 0
+
+    def add_turn(self, question: str, answer: str) -> None:
+        self.turns.append((question, answer))
+
+    def _cost(self, content: str) -> int:
+        return self.count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def _system_message(self, summary: str) -> str:
+        if not summary:
+            return self.system_instructions
+        return f"{self.system_instructions}\n\nSummary of the conversation so far:\n{summary}"
+
+    def messages_for(self, question: str) -> List[Dict[str, str]]:
+        """Request messages for ``question`` that fit in ``budget_tokens``."""
+        remaining = self.budget_tokens - self._cost(question) - self._cost(self.system_instructions)
+        summary = self.summary
+        if summary and self._cost(summary) > remaining:
+            summary = _truncate_words(summary, max(0, remaining) // 2)
+        remaining -= self.count_tokens(summary)
+
+        history: List[Dict[str, str]] = []
+        for q, a in reversed(self.turns):
+            cost = self._cost(q) + self._cost(a)
+            if cost > remaining:
+                break
+            history[:0] = [{"role": "user", "content": q}, {"role": "assistant", "content": a}]
+            remaining -= cost
+        return [{"role": "system", "content": self._system_message(summary)}] + history + [{"role": "user", "content": question}]
+
+    async def compact(self) -> None:
+        """Fold turns older than ``keep_recent_turns`` into the summary.
+
+        The old turns stay in ``turns`` until their summary is ready, so a
+        request built while the summarizer is running still sees them.
+        """
+        async with self._lock:
+            count = len(self.turns) - self.keep_recent_turns
+            if count <= 0:
+                return
+            cleared = self._cleared
+            evicted = list(islice(self.turns, count))
+            summary = await self._summarize(self.summary, evicted)
+            if cleared != self._cleared:
+                return
+            for _ in range(count):
+                self.turns.popleft()
+            self.summary = summary
+
+    async def _summarize(self, summary: str, evicted: List[Tuple[str, str]]) -> str:
+        exchanges = "\n".join(f"Learner: {q}\nTutor: {a}" for q, a in evicted)
+        if self.summarizer is not None:
+            prompt = SUMMARY_PROMPT.format(words=self.summary_words, summary=summary or "(none)", exchanges=exchanges)
+            try:
+                updated = (await self.summarizer.complete([{"role": "user", "content": prompt}])).strip()
+                if updated:
+                    return _truncate_words(updated, self.summary_words)
+            except Exception as e:
+                print(f"Summarising conversation failed: {e}")
+        # Extractive fallback: the question and the first sentence of each answer
+        lines = [summary] if summary else []
+        for q, a in evicted:
+            lines.append(f"Learner asked: {q} Tutor: {a.split('. ')[0].strip()}")
+        return _truncate_words(" ".join(lines), self.summary_words, keep="end")
+
+    def clear(self) -> None:
+        self._cleared += 1
+        self.summary = ""
+        self.turns.clear()
+
+
+def _truncate_words(text: str, limit: int, keep: str = "start") -> str:
+    words = text.split()
+    if len(words) <= limit:
+        return text
+    if limit <= 0:
+        return ""
+    return " ".join(words[-limit:] if keep == "end" else words[:limit])
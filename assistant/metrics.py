@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+# Marks recorded for every turn, in the order they normally happen
+MARKS = [
+    "speech_end",        # the user stopped talking (VAD onset of trailing silence)
+    "final_transcript",  # endpointer fired and the recognizer returned the utterance
+    "request_sent",      # LLM request issued (or cache lookup started)
+    "first_token",       # first streamed delta (or cache hit)
+    "full_answer",       # stream finished
+    "first_audio",       # first synthesized clip started playing
+    "playback_end",      # last clip of the answer finished playing
+]
+
+# Derived stage durations: name -> (from mark, to mark)
+STAGES: Dict[str, Tuple[str, str]] = {
+    "endpointing": ("speech_end", "final_transcript"),
+    "dispatch": ("final_transcript", "request_sent"),
+    "time_to_first_token": ("request_sent", "first_token"),
+    "generation": ("first_token", "full_answer"),
+    "first_sentence_audio": ("first_token", "first_audio"),
+    "time_to_first_audio": ("speech_end", "first_audio"),
+    "playback": ("first_audio", "playback_end"),
+    "turn": ("speech_end", "playback_end"),
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 < q <= 100)."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, int(math.ceil(q / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+class MetricsRecorder:
+    """Per-turn latency spans with rolling percentiles.
+
+    ``mark`` stamps a ``time.monotonic()`` reading for one of ``MARKS``;
+    ``finish`` returns the turn as a row (marks in ms relative to
+    ``speech_end`` plus derived stage durations) and adds its stages to
+    rolling windows that ``summary`` reports as p50/p95. Turns annotated
+    with an ``error`` are counted as failed and kept out of the windows.
+    A summary table is printed every ``summary_every`` finished turns. The recorder never
+    touches the disk; the pipeline writes each row into its turn record in
+    the ``SessionLogger``.
+    """
+
+    def __init__(self, window: int = 200, summary_every: int = 10, clock=time.monotonic):
+        self.summary_every = summary_every
+        self.clock = clock
+        self._turns: Dict[int, Dict[str, Any]] = {}
+        self._windows: Dict[str, Deque[float]] = {name: deque(maxlen=window) for name in STAGES}
+        self._lock = threading.Lock()
+        self.finished = 0
+        self.interrupted = 0
+        self.failed = 0
+
+    def start_turn(self, turn: int, speech_end: Optional[float] = None, **info: Any) -> None:
+        with self._lock:
+            self._turns[turn] = {"marks": {}, "info": dict(info), "wall_time": time.time()}
+        if speech_end is not None:
+            self.mark(turn, "speech_end", speech_end)
+
+    def mark(self, turn: int, name: str, at: Optional[float] = None, once: bool = True) -> None:
+        with self._lock:
+            record = self._turns.get(turn)
+            if record is None or (once and name in record["marks"]):
+                return
+            record["marks"][name] = self.clock() if at is None else at
+
+    def annotate(self, turn: int, **info: Any) -> None:
+        with self._lock:
+            record = self._turns.get(turn)
+            if record is not None:
+                record["info"].update(info)
+
+    def finish(self, turn: int, interrupted: bool = False) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._turns.pop(turn, None)
+            if record is None:
+                return None
+            marks = record["marks"]
+            origin = marks.get("speech_end", min(marks.values()) if marks else 0.0)
+            stages = {
+                name: round((marks[b] - marks[a]) * 1000.0, 1)
+                for name, (a, b) in STAGES.items()
+                if a in marks and b in marks
+            }
+            row = {
+                "turn": turn,
+                "time": record["wall_time"],
+                "interrupted": interrupted,
+                "marks_ms": {k: round((v - origin) * 1000.0, 1) for k, v in sorted(marks.items(), key=lambda kv: kv[1])},
+                "stages_ms": stages,
+            }
+            row.update(record["info"])
+            failed = not interrupted and "error" in record["info"]
+            if interrupted:
+                self.interrupted += 1
+            elif failed:
+                self.failed += 1
+            else:
+                self.finished += 1
+                for name, value in stages.items():
+                    self._windows[name].append(value)
+            print_summary = not (interrupted or failed) and self.summary_every > 0 and self.finished % self.summary_every == 0
+        if print_summary:
+            print(self.format_summary())
+        return row
+
+    def abandon_all(self) -> List[Dict[str, Any]]:
+        """Finish every open turn as interrupted (barge-in) and return their rows."""
+        with self._lock:
+            turns = list(self._turns)
+        rows = [self.finish(turn, interrupted=True) for turn in turns]
+        return [row for row in rows if row is not None]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            windows = {name: list(values) for name, values in self._windows.items()}
+        return {
+            name: {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+            for name, values in windows.items()
+            if values
+        }
+
+    def format_summary(self) -> str:
+        lines = [f"latency over last {max((s['count'] for s in self.summary().values()), default=0)} turns (ms)"]
+        for name, st in self.summary().items():
+            lines.append(f"  {name:<22} p50 {st['p50']:>8.0f}   p95 {st['p95']:>8.0f}")
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        out = [
+            "# HELP assistant_stage_latency_seconds Voice assistant per-turn stage latency (rolling window).",
+            "# TYPE assistant_stage_latency_seconds summary",
+        ]
+        for name, st in self.summary().items():
+            for q, key in (("0.5", "p50"), ("0.95", "p95")):
+                out.append(f'assistant_stage_latency_seconds{{stage="{name}",quantile="{q}"}} {st[key] / 1000.0:.4f}')
+            out.append(f'assistant_stage_latency_seconds_count{{stage="{name}"}} {st["count"]}')
+        out.append("# TYPE assistant_turns_total counter")
+        out.append(f'assistant_turns_total{{status="completed"}} {self.finished}')
+        out.append(f'assistant_turns_total{{status="interrupted"}} {self.interrupted}')
+        out.append(f'assistant_turns_total{{status="failed"}} {self.failed}')
+        return "\n".join(out) + "\n"
+
+
+def serve_prometheus(recorder: MetricsRecorder, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``recorder`` in Prometheus text format at ``/metrics`` on a daemon thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = recorder.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
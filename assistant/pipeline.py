@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from .audio import AudioRingBuffer
+from .backends import build_prompt
+from .cache import CacheEntry, ResponseCache, depends_on_context
+from .memory import ConversationMemory
+from .metrics import MetricsRecorder
+from .playback import PCMAudio, decode_audio
+from .recognition import recognize_chunk
+from .sentences import SentenceChunker
+from .session_log import SessionLogger
+from .keywords import has_keyword, is_keyword, strip_trailing_keyword, text_after_keyword
+from .vad import Endpointer, EndpointResult
+
+
+class VoiceAssistant:
+    """Concurrent capture -> recognition -> LLM -> TTS -> playback pipeline.
+
+    Each stage runs as its own task and hands work to the next through an
+    ``asyncio.Queue``, so the microphone is read and recognised while the
+    model is thinking or an answer is playing. A voice-activity endpointer
+    sits in front of the recognizer: silence is never decoded, and an
+    utterance is complete once the hangover time passes without speech.
+    While idle, only a small keyword-grammar ``spotter`` listens for the wake
+    word; the large-vocabulary recognizer is engaged after it is heard.
+    Answers are streamed: every complete sentence is synthesised and queued
+    for playback while the model is still generating the next one. Queue
+    items carry the epoch they were produced in. The user barges in by
+    saying the wake word while an answer is being generated or played, or,
+    with ``barge_in_on_speech=True``, by simply starting to speak (the
+    endpointer's speech onset); either bumps the epoch, cancels the request
+    in flight and every stage silently drops work from older epochs. Onset
+    barge-in is off by default: without echo cancellation the answer's own
+    audio reaches the microphone and would cut itself off. With a
+    ``ResponseCache``, a repeated question replays the stored answer and
+    audio without calling the model or TTS, and every fully spoken answer is
+    added to the cache. Once there is conversation history, only questions
+    that stand on their own use the cache; a follow-up such as "give me
+    another example" depends on what was said before. Each finished or
+    interrupted turn is handed to the optional ``SessionLogger`` as one
+    record, which is written to disk off the event loop.
+    """
+
+    def __init__(
+        self,
+        recognizer: Any,
+        capture: Any,
+        llm: Any,
+        tts: Any,
+        player: Any,
+        earcon: Optional[PCMAudio],
+        start_keyword: str = "start",
+        end_keyword: str = "end",
+        endpointer: Optional[Endpointer] = None,
+        spotter: Any = None,
+        memory: Optional[ConversationMemory] = None,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        session_log: Optional[SessionLogger] = None,
+        barge_in_on_speech: bool = False,
+    ):
+        self.recognizer = recognizer
+        self.capture = capture
+        self.llm = llm
+        self.tts = tts
+        self.player = player
+        self.earcon = earcon
+        self.start_keyword = start_keyword
+        self.end_keyword = end_keyword
+        self.endpointer = endpointer or Endpointer()
+        # Keyword-grammar recognizer used while idle; None decodes everything with the full model
+        self.spotter = spotter
+
+        self.memory = memory
+        self.cache = cache
+        self.metrics = metrics
+        self.session_log = session_log
+        self.barge_in_on_speech = barge_in_on_speech
+        # Question/answer of each open turn, written to the session log when the turn ends
+        self._turn_log: Dict[int, Dict[str, Any]] = {}
+        self._speech_end_at: Optional[float] = None
+        self._decoding = False
+        # Per-turn sentences and encoded audio collected for the response cache
+        self._recording: Dict[int, Dict[str, Any]] = {}
+        self.is_recognizing = False
+        self.turns = 0
+        self._utterance: List[str] = []
+        # The current utterance contained the wake word that woke the assistant
+        self._woken_by_utterance = False
+        # Audio of the current idle utterance, capped at ~10 s of 4000-frame chunks
+        self._idle_audio: Deque[bytes] = deque(maxlen=40)
+        self._epoch = 0
+        self._in_flight = 0
+        self._llm_job: Optional[asyncio.Future] = None
+        self._background: Set[asyncio.Task] = set()
+
+    # -- stages -------------------------------------------------------------
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.ring = AudioRingBuffer(loop)
+        self.questions: asyncio.Queue[Tuple[int, int, str]] = asyncio.Queue()
+        # (epoch, turn, sentence number, sentence text, cached encoded audio); a None sentence ends the turn
+        self.answers: asyncio.Queue[Tuple[int, int, int, Optional[str], Optional[bytes]]] = asyncio.Queue()
+        # (epoch, turn, sentence number, decoded clip); None ends the turn
+        self.clips: asyncio.Queue[Tuple[int, int, int, Optional[PCMAudio]]] = asyncio.Queue()
+
+        self.capture.start(self.ring)
+        workers = [
+            asyncio.create_task(self._llm_loop(), name="llm"),
+            asyncio.create_task(self._tts_loop(), name="tts"),
+            asyncio.create_task(self._playback_loop(), name="playback"),
+        ]
+        print("Listening...")
+        try:
+            await self._recognize_loop()
+        finally:
+            self.capture.stop()
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _recognize_loop(self) -> None:
+        while True:
+            self._decoding = False
+            data = await self.ring.pop()
+            if data is None:
+                return
+            self._decoding = True
+            segment = self.endpointer.process(data)
+            if segment.started and self._in_flight > 0 and self.barge_in_on_speech:
+                self._barge_in()
+            if not segment.in_speech:
+                # Silence between utterances never reaches the recognizer
+                continue
+            if segment.ended:
+                self._speech_end_at = time.monotonic() - segment.trailing_silence_ms / 1000.0
+            if self.spotter is not None and not self.is_recognizing:
+                await self._spot(segment)
+                continue
+            result = await asyncio.to_thread(recognize_chunk, self.recognizer, segment.audio, segment.ended)
+            self._handle_result(result, segment.ended)
+
+    async def _spot(self, segment: EndpointResult) -> None:
+        """Idle mode: only the small keyword grammar decodes the audio.
+
+        The utterance's audio is kept until it ends; once the wake word shows
+        up it is replayed through the full recognizer, so a question spoken in
+        the same breath as the wake word is not lost.
+        """
+        self._idle_audio.append(segment.audio)
+        result = await asyncio.to_thread(recognize_chunk, self.spotter, segment.audio, segment.ended)
+        heard = result.get("text") or result.get("partial") or ""
+        if has_keyword(heard, self.start_keyword):
+            if not segment.ended:
+                self.spotter.Reset()
+            audio = b"".join(self._idle_audio)
+            self._idle_audio.clear()
+            self._woken_by_utterance = True
+            self._start_recognizing()
+            result = await asyncio.to_thread(recognize_chunk, self.recognizer, audio, segment.ended)
+            self._handle_result(result, segment.ended)
+        elif segment.ended:
+            self._idle_audio.clear()
+
+    async def _llm_loop(self) -> None:
+        while True:
+            epoch, turn, question = await self.questions.get()
+            if epoch != self._epoch:
+                continue
+            cacheable = self.cache is not None and not (self._has_context() and depends_on_context(question))
+            if cacheable:
+                hit = await asyncio.to_thread(self.cache.lookup, question)
+                if hit is not None:
+                    if epoch == self._epoch:
+                        self._mark(turn, "request_sent")
+                        self._mark(turn, "first_token")
+                        self._mark(turn, "full_answer")
+                        if self.metrics is not None:
+                            self.metrics.annotate(turn, cached=True)
+                        self._replay_cached(epoch, turn, question, hit)
+                    continue
+            self._llm_job = asyncio.ensure_future(self._stream_answer(epoch, turn, question, cacheable))
+            await asyncio.wait({self._llm_job})
+            job, self._llm_job = self._llm_job, None
+            if not job.cancelled() and job.exception() is not None:
+                print(f"LLM request failed: {job.exception()}")
+
+    async def _stream_answer(self, epoch: int, turn: int, question: str, cacheable: bool = False) -> None:
+        """Forward each complete sentence to TTS while the rest of the answer streams in."""
+        chunker = SentenceChunker()
+        parts: List[str] = []
+        seq = 0
+        if cacheable:
+            self._recording[turn] = {"question": question, "answer": None, "sentences": [], "clips": [], "complete": True}
+        try:
+            messages = build_prompt(question, turn, self.memory)
+            self._mark(turn, "request_sent")
+            async for delta in self.llm.stream(messages):
+                if not parts:
+                    self._mark(turn, "first_token")
+                parts.append(delta)
+                for sentence in chunker.feed(delta):
+                    seq += 1
+                    self.answers.put_nowait((epoch, turn, seq, sentence, None))
+            for sentence in chunker.flush():
+                seq += 1
+                self.answers.put_nowait((epoch, turn, seq, sentence, None))
+        except Exception as e:
+            # Recorded before the end-of-turn marker below lets playback close the turn
+            if self.metrics is not None:
+                self.metrics.annotate(turn, error=repr(e))
+            if turn in self._turn_log:
+                self._turn_log[turn]["error"] = repr(e)
+            raise
+        finally:
+            # End-of-turn marker, so playback can account for the turn even if the stream failed
+            if epoch == self._epoch:
+                self.answers.put_nowait((epoch, turn, seq + 1, None, None))
+        self._mark(turn, "full_answer")
+        msg = "".join(parts)
+        if turn in self._recording:
+            self._recording[turn]["answer"] = msg
+        self._finish_answer(turn, question, msg)
+
+    def _has_context(self) -> bool:
+        """Whether earlier turns (or their summary) will be sent with the next question."""
+        return self.memory is not None and bool(self.memory.turns or self.memory.summary)
+
+    def _replay_cached(self, epoch: int, turn: int, question: str, hit: CacheEntry) -> None:
+        """Queue a cached answer's stored audio; no request and no synthesis."""
+        for seq, (sentence, encoded) in enumerate(zip(hit.sentences, hit.clips or []), start=1):
+            self.answers.put_nowait((epoch, turn, seq, sentence, encoded))
+        self.answers.put_nowait((epoch, turn, len(hit.sentences) + 1, None, None))
+        self._finish_answer(turn, question, hit.answer, cached=True)
+
+    def _finish_answer(self, turn: int, question: str, msg: str, cached: bool = False) -> None:
+        if self.memory is not None:
+            self.memory.add_turn(question, msg)
+            self._spawn(self.memory.compact(), "Summarising conversation")
+        entry = self._turn_log.get(turn)
+        if entry is not None:
+            entry["answer"] = msg
+            entry["cached"] = cached
+
+    async def _tts_loop(self) -> None:
+        while True:
+            epoch, turn, seq, sentence, encoded = await self.answers.get()
+            if epoch != self._epoch:
+                continue
+            record = self._recording.get(turn)
+            if sentence is None:
+                self._recording.pop(turn, None)
+                if record is not None and record["answer"] and record["complete"]:
+                    self._spawn(
+                        asyncio.to_thread(self.cache.store, record["question"], record["answer"], record["sentences"], record["clips"]),
+                        "Caching answer",
+                    )
+                await self.clips.put((epoch, turn, seq, None))
+                continue
+            try:
+                if encoded is None:
+                    encoded = await self.tts.synthesize(sentence)
+                clip = await asyncio.to_thread(decode_audio, encoded, self.player.sample_rate, self.player.channels)
+            except Exception as e:
+                print(f"TTS failed: {e}")
+                if record is not None:
+                    record["complete"] = False
+                continue
+            if record is not None:
+                record["sentences"].append(sentence)
+                record["clips"].append(encoded)
+            if epoch == self._epoch:
+                await self.clips.put((epoch, turn, seq, clip))
+
+    async def _playback_loop(self) -> None:
+        while True:
+            epoch, turn, seq, clip = await self.clips.get()
+            if epoch != self._epoch:
+                continue
+            if clip is None:
+                self._in_flight -= 1
+                self._mark(turn, "playback_end")
+                row = self.metrics.finish(turn) if self.metrics is not None else None
+                self._log_turn(turn, row)
+                print("Listening...")
+                continue
+            self._mark(turn, "first_audio")
+            await self.player.play(clip)
+
+    # -- recognition ----------------------------------------------------------
+
+    def _handle_result(self, result_dict: Dict[str, Any], utterance_ended: bool) -> None:
+        partial_text = result_dict.get("partial", "").strip()
+        if partial_text and self.is_recognizing:
+            print(f"speaking : {partial_text}")
+        text = result_dict.get("text", "").strip()
+        if text:
+            self._utterance.append(text)
+        if utterance_ended:
+            segments, self._utterance = self._utterance, []
+            self._handle_utterance(segments)
+
+    def _handle_utterance(self, segments: List[str]) -> None:
+        """Act on a finished utterance, given as the recognizer's segments.
+
+        The recognizer closes a segment at a pause, so the end keyword only
+        counts when it was said on its own after the question ("what is a
+        noun ... end"); "how does the story end" is asked as spoken.
+        """
+        woke, self._woken_by_utterance = self._woken_by_utterance, False
+        text = " ".join(segments)
+        if not text:
+            return
+        if not self.is_recognizing and has_keyword(text, self.start_keyword):
+            self._start_recognizing()
+            woke = True
+        if woke:
+            # Whatever followed the wake word in the same breath is the question;
+            # once awake, "start" is just a word in it
+            text = text_after_keyword(text, self.start_keyword)
+        if not self.is_recognizing or not text:
+            return
+        if is_keyword(segments[-1], self.end_keyword):
+            print("recognition stopped")
+            self._play_earcon()
+            text = strip_trailing_keyword(text, self.end_keyword)
+        self._submit(text)
+
+    def _start_recognizing(self) -> None:
+        self.is_recognizing = True
+        self._barge_in()
+        print("recognition started!")
+        self._play_earcon()
+
+    def wake(self, announce: bool = True) -> None:
+        """Start listening for a question as if the wake word had been heard."""
+        if announce:
+            self._start_recognizing()
+        else:
+            self.is_recognizing = True
+
+    @property
+    def idle(self) -> bool:
+        """No buffered audio, nothing being decoded and no answer in progress.
+
+        Only meaningful when read on the event loop thread.
+        """
+        return not self._decoding and len(self.ring) == 0 and self._in_flight <= 0
+
+    def _submit(self, question: str) -> None:
+        self.is_recognizing = False
+        if not question:
+            return
+        self.turns += 1
+        self._in_flight += 1
+        if self.session_log is not None:
+            self._turn_log[self.turns] = {"turn": self.turns, "question": question, "asked_at": round(time.time(), 3)}
+        if self.metrics is not None:
+            self.metrics.start_turn(self.turns, speech_end=self._speech_end_at)
+            self._mark(self.turns, "final_transcript")
+        self.questions.put_nowait((self._epoch, self.turns, question))
+
+    # -- barge-in -------------------------------------------------------------
+
+    def _barge_in(self) -> None:
+        """Abandon the answer in progress when the user starts talking over it."""
+        if self._in_flight <= 0:
+            return
+        self._epoch += 1
+        self._in_flight = 0
+        self._recording.clear()
+        rows = self.metrics.abandon_all() if self.metrics is not None else []
+        for turn in sorted(self._turn_log):
+            self._log_turn(turn, next((r for r in rows if r["turn"] == turn), None), interrupted=True)
+        if self._llm_job is not None:
+            self._llm_job.cancel()
+        self.player.stop()
+        for queue in (self.questions, self.answers, self.clips):
+            while not queue.empty():
+                queue.get_nowait()
+
+    def _log_turn(self, turn: int, metrics_row: Optional[Dict[str, Any]], interrupted: bool = False) -> None:
+        entry = self._turn_log.pop(turn, None)
+        if entry is None or self.session_log is None:
+            return
+        entry["interrupted"] = interrupted
+        if metrics_row is not None:
+            entry["latency_ms"] = metrics_row["stages_ms"]
+            entry["marks_ms"] = metrics_row["marks_ms"]
+        self.session_log.log("turn", **entry)
+
+    def _mark(self, turn: int, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.mark(turn, name)
+
+    def _play_earcon(self) -> None:
+        if self.earcon is not None:
+            self._spawn(self.player.play(self.earcon), "Earcon playback")
+
+    def _spawn(self, coro: Any, what: str) -> None:
+        """Run ``coro`` in the background, reporting (not raising) its failure."""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+
+        def done(t: asyncio.Task) -> None:
+            self._background.discard(t)
+            if not t.cancelled() and t.exception() is not None:
+                print(f"{what} failed: {t.exception()}")
+
+        task.add_done_callback(done)
+
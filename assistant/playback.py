@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from typing import Any
+
+
+OUTPUT_SAMPLE_RATE = 24000  # edge-tts voices are 24 kHz mono
+OUTPUT_CHANNELS = 1
+SAMPLE_WIDTH = 2
+
+
+@dataclass
+class PCMAudio:
+    samples: bytes  # interleaved signed 16-bit little-endian
+    sample_rate: int = OUTPUT_SAMPLE_RATE
+    channels: int = OUTPUT_CHANNELS
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(SAMPLE_WIDTH * self.channels * self.sample_rate)
+
+
+def decode_audio(data: bytes, sample_rate: int = OUTPUT_SAMPLE_RATE, channels: int = OUTPUT_CHANNELS) -> PCMAudio:
+    """Decode an encoded clip (MP3/WAV/FLAC/Vorbis) in memory to 16-bit PCM.
+
+    WAV data already in the requested format is unpacked with the standard
+    library; anything else is decoded and resampled with ``miniaudio``.
+    """
+    if data[:4] == b"RIFF":
+        with wave.open(io.BytesIO(data), "rb") as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (sample_rate, channels, SAMPLE_WIDTH):
+                return PCMAudio(wav.readframes(wav.getnframes()), sample_rate, channels)
+    try:
+        import miniaudio  # type: ignore
+    except Exception as e:
+        raise RuntimeError(f"miniaudio is required to decode compressed audio but failed to import: {e}")
+    decoded = miniaudio.decode(
+        data,
+        output_format=miniaudio.SampleFormat.SIGNED16,
+        nchannels=channels,
+        sample_rate=sample_rate,
+    )
+    return PCMAudio(decoded.samples.tobytes(), sample_rate, channels)
+
+
+def load_audio_file(path: str, sample_rate: int = OUTPUT_SAMPLE_RATE, channels: int = OUTPUT_CHANNELS) -> PCMAudio:
+    with open(path, "rb") as f:
+        return decode_audio(f.read(), sample_rate=sample_rate, channels=channels)
+
+
+class PyAudioOutput:
+    """Output stream on an already-initialised ``pyaudio.PyAudio`` instance."""
+
+    def __init__(self, pa: Any, sample_rate: int = OUTPUT_SAMPLE_RATE, channels: int = OUTPUT_CHANNELS):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._stream = pa.open(
+            format=pa.get_format_from_width(SAMPLE_WIDTH),
+            channels=channels,
+            rate=sample_rate,
+            output=True,
+        )
+
+    def write(self, frames: bytes) -> None:
+        self._stream.write(frames)
+
+    def close(self) -> None:
+        self._stream.stop_stream()
+        self._stream.close()
+
+
+class NullOutput:
+    """Discards audio; with ``realtime`` it still takes as long as playing would."""
+
+    def __init__(self, sample_rate: int = OUTPUT_SAMPLE_RATE, channels: int = OUTPUT_CHANNELS, realtime: bool = False):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.realtime = realtime
+        self.frames_written = 0
+
+    def write(self, frames: bytes) -> None:
+        n = len(frames) // (SAMPLE_WIDTH * self.channels)
+        self.frames_written += n
+        if self.realtime:
+            time.sleep(n / float(self.sample_rate))
+
+    def close(self) -> None:
+        pass
+
+
+class WavFileOutput:
+    """Appends everything played to a WAV file, for tests and recordings."""
+
+    def __init__(self, path: str, sample_rate: int = OUTPUT_SAMPLE_RATE, channels: int = OUTPUT_CHANNELS):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(SAMPLE_WIDTH)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, frames: bytes) -> None:
+        self._wav.writeframes(frames)
+
+    def close(self) -> None:
+        self._wav.close()
+
+
+class AudioPlayer:
+    """Plays ``PCMAudio`` on an output device from a worker thread.
+
+    Clips are written in small blocks and play one at a time; ``stop`` cuts
+    off the clip playing now and any clip already waiting for the device,
+    within one block (about 40 ms by default).
+    """
+
+    def __init__(self, device: Any, block_frames: int = 1024):
+        self.device = device
+        self.block_frames = block_frames
+        self._device_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._generation = 0
+        self._active = 0
+
+    @property
+    def sample_rate(self) -> int:
+        return self.device.sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self.device.channels
+
+    @property
+    def busy(self) -> bool:
+        with self._state_lock:
+            return self._active > 0
+
+    def stop(self) -> None:
+        with self._state_lock:
+            self._generation += 1
+
+    def _play_sync(self, audio: PCMAudio, generation: int) -> bool:
+        block = self.block_frames * SAMPLE_WIDTH * audio.channels
+        samples = audio.samples
+        with self._device_lock:
+            for offset in range(0, len(samples), block):
+                if generation != self._generation:
+                    return False
+                self.device.write(samples[offset:offset + block])
+        return True
+
+    async def play(self, audio: PCMAudio) -> bool:
+        """Play ``audio``; returns False if it was interrupted by ``stop``."""
+        with self._state_lock:
+            generation = self._generation
+            self._active += 1
+        try:
+            return await asyncio.to_thread(self._play_sync, audio, generation)
+        finally:
+            with self._state_lock:
+                self._active -= 1
+
+    def close(self) -> None:
+        self.stop()
+        with self._device_lock:
+            self.device.close()
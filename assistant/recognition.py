@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+
+def recognize_chunk(recognizer: Any, data: bytes, final: bool) -> Dict[str, Any]:
+    """Feed ``data`` to a Vosk recognizer and return its result as a dict.
+
+    With ``final`` the utterance is closed and ``{"text": ...}`` returned;
+    otherwise either a completed segment (``{"text": ...}``) or the running
+    ``{"partial": ...}`` hypothesis. Blocks while decoding, so callers on an
+    event loop run it in a thread.
+    """
+    if final:
+        if data:
+            recognizer.AcceptWaveform(data)
+        result = recognizer.FinalResult()
+    elif recognizer.AcceptWaveform(data):
+        result = recognizer.Result()
+    else:
+        result = recognizer.PartialResult()
+    try:
+        return json.loads(result)
+    except json.JSONDecodeError:
+        return {}
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import re
+from typing import List
+
+
+# A sentence ends at terminal punctuation (plus closing quotes/brackets) followed by
+# whitespace, or at a line break. Punctuation at the very end of the buffer is not a
+# boundary yet: the next delta may turn "3." into "3.5".
+BOUNDARY_RE = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+
+ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "vs.", "etc.", "e.g.", "i.e.", "approx."}
+
+
+def _ends_with_abbreviation(text: str) -> bool:
+    last = text.rsplit(None, 1)[-1].lower() if text else ""
+    return last in ABBREVIATIONS
+
+
+class SentenceChunker:
+    """Incrementally splits streamed LLM deltas into speakable sentences.
+
+    Fragments shorter than ``min_chars`` are held back and joined with the
+    following sentence so TTS is not asked to voice a lone "Yes." mid-answer.
+    """
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buf = ""
+
+    def feed(self, delta: str) -> List[str]:
+        self._buf += delta
+        sentences: List[str] = []
+        start = 0
+        for m in BOUNDARY_RE.finditer(self._buf):
+            candidate = self._buf[start:m.end()].strip()
+            if len(candidate) < self.min_chars or _ends_with_abbreviation(candidate):
+                continue
+            sentences.append(candidate)
+            start = m.end()
+        self._buf = self._buf[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        rest = self._buf.strip()
+        self._buf = ""
+        return [rest] if rest else []
+
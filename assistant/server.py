@@ -0,0 +1,212 @@
+"""Speech recognition server: one Vosk model shared by many TCP clients.
+
+Usage::
+
+    python -m assistant.server --model PATH [--port 2700] [--workers 4]
+
+The model is loaded once; each connection gets its own lightweight
+``KaldiRecognizer`` on that model. Protocol (both directions over one TCP
+connection):
+
+- client -> server: frames of a 4-byte big-endian length followed by that
+  many bytes of 16-bit mono PCM at 16 kHz. A zero-length frame marks the
+  end of an utterance and forces a final result. Closing the write side
+  ends the session.
+- server -> client: one JSON object per line: ``{"partial": ...}`` while
+  speech is decoded, ``{"text": ...}`` when the VAD ends an utterance, and
+  ``{"text": ..., "flush": true, "latency_ms": ...}`` in reply to each
+  end-of-utterance frame (the text of everything since the previous one).
+
+Decoding runs on a shared thread pool (Vosk releases the GIL while
+decoding, and a model cannot be shared across processes). Each client has
+a bounded queue of undecoded frames; when it is full the server stops
+reading that socket, so a client sending faster than it can be decoded is
+throttled by TCP flow control instead of growing server memory.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .audio import SAMPLE_RATE
+from .recognition import recognize_chunk
+from .vad import Endpointer
+
+FRAME_HEADER = struct.Struct("!I")
+MAX_FRAME_BYTES = 1 << 20
+
+
+class RecognitionServer:
+    """Serves ``recognizer_factory()`` recognizers to TCP clients.
+
+    ``max_pending`` bounds the frames queued per client (backpressure);
+    ``max_clients`` bounds concurrent sessions, further connections are
+    told so and closed. With ``use_vad`` silence is skipped and utterances
+    are ended by the same endpointer as the local assistant.
+    """
+
+    def __init__(
+        self,
+        recognizer_factory: Callable[[], Any],
+        workers: int = 4,
+        max_pending: int = 16,
+        max_clients: int = 64,
+        use_vad: bool = True,
+    ):
+        self.recognizer_factory = recognizer_factory
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decode")
+        self.max_pending = max_pending
+        self.max_clients = max_clients
+        self.use_vad = use_vad
+        self.clients = 0
+        self.sessions = 0
+        self.audio_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.throttled = 0
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 2700) -> None:
+        server = await asyncio.start_server(self._handle, host, port)
+        addresses = ", ".join(str(s.getsockname()[:2]) for s in server.sockets)
+        print(f"Recognition server listening on {addresses}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.clients >= self.max_clients:
+            writer.write(b'{"error": "server busy"}\n')
+            await writer.drain()
+            writer.close()
+            return
+        self.clients += 1
+        self.sessions += 1
+        session = self.sessions
+        peer = writer.get_extra_info("peername")
+        loop = asyncio.get_running_loop()
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        stats = {"audio": 0.0, "decode": 0.0}
+        decoder: Optional[asyncio.Task] = None
+        try:
+            recognizer = await loop.run_in_executor(self.pool, self.recognizer_factory)
+            decoder = asyncio.create_task(self._decode_loop(recognizer, pending, writer, stats))
+            while not decoder.done():
+                try:
+                    (size,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                    if size > MAX_FRAME_BYTES:
+                        raise ValueError(f"frame of {size} bytes exceeds {MAX_FRAME_BYTES}")
+                    payload = await reader.readexactly(size) if size else b""
+                except asyncio.IncompleteReadError:
+                    break
+                if not await _enqueue(pending, (payload, time.monotonic()), decoder):
+                    self.throttled += 1
+            if not decoder.done():
+                await _enqueue(pending, None, decoder)
+            await decoder
+        except (ConnectionError, ValueError) as e:
+            print(f"Session {session} {peer}: {e}")
+        finally:
+            if decoder is not None and not decoder.done():
+                decoder.cancel()
+            self.clients -= 1
+            self.audio_seconds += stats["audio"]
+            self.decode_seconds += stats["decode"]
+            speed = stats["audio"] / stats["decode"] if stats["decode"] else float("nan")
+            print(f"Session {session} {peer} closed: {stats['audio']:.1f}s audio, {speed:.1f}x real-time, {self.clients} connected")
+            writer.close()
+
+    async def _decode_loop(self, recognizer: Any, pending: asyncio.Queue, writer: asyncio.StreamWriter, stats: Dict[str, float]) -> None:
+        loop = asyncio.get_running_loop()
+        endpointer = Endpointer() if self.use_vad else None
+        texts: List[str] = []
+        last_partial = ""
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            payload, received = item
+            flush = not payload
+            if flush:
+                audio, final = b"", endpointer is None or endpointer.in_speech
+                endpointer = Endpointer() if self.use_vad else None
+            elif endpointer is not None:
+                segment = endpointer.process(payload)
+                if not segment.in_speech:
+                    continue
+                audio, final = segment.audio, segment.ended
+            else:
+                audio, final = payload, False
+            result: Dict[str, Any] = {}
+            if audio or final:
+                started = time.perf_counter()
+                result = await loop.run_in_executor(self.pool, recognize_chunk, recognizer, audio, final)
+                stats["decode"] += time.perf_counter() - started
+                stats["audio"] += len(audio) / (2.0 * SAMPLE_RATE)
+            text = result.get("text", "").strip()
+            if text:
+                texts.append(text)
+            if flush:
+                reply = {"text": " ".join(texts), "flush": True, "latency_ms": round((time.monotonic() - received) * 1000.0, 1)}
+                texts = []
+                last_partial = ""
+            elif "text" in result:
+                reply = {"text": text}
+                last_partial = ""
+            elif result.get("partial") and result["partial"] != last_partial:
+                last_partial = result["partial"]
+                reply = {"partial": last_partial}
+            else:
+                continue
+            writer.write((json.dumps(reply) + "\n").encode("utf-8"))
+            await writer.drain()
+
+
+async def _enqueue(pending: asyncio.Queue, item: Any, decoder: asyncio.Task) -> bool:
+    """Queue ``item``, waiting for room unless the decoder has stopped; False if it had to wait."""
+    if not pending.full():
+        pending.put_nowait(item)
+        return True
+    put = asyncio.ensure_future(pending.put(item))
+    await asyncio.wait({put, decoder}, return_when=asyncio.FIRST_COMPLETED)
+    put.cancel()
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve Vosk recognition to many TCP clients from one loaded model.")
+    parser.add_argument("--model", required=True, help="Path to the Vosk model directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2700)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Decoder threads shared by all clients")
+    parser.add_argument("--max-pending", type=int, default=16, help="Undecoded frames buffered per client before reads pause")
+    parser.add_argument("--max-clients", type=int, default=64)
+    parser.add_argument("--no-vad", action="store_true", help="Decode all audio instead of VAD-gated speech")
+    args = parser.parse_args()
+
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+
+    SetLogLevel(-1)
+    started = time.perf_counter()
+    model = Model(args.model)
+    print(f"Model loaded in {time.perf_counter() - started:.1f}s")
+    server = RecognitionServer(
+        lambda: KaldiRecognizer(model, SAMPLE_RATE),
+        workers=args.workers,
+        max_pending=args.max_pending,
+        max_clients=args.max_clients,
+        use_vad=not args.no_vad,
+    )
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.pool.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    main()
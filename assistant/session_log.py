@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class SessionLogger:
+    """Append-only JSONL session log written from a background thread.
+
+    ``log`` only enqueues the record, so it is safe to call from the event
+    loop (or the audio thread) without touching the disk. The writer thread
+    collects records into batches and writes and flushes a batch when
+    ``batch_size`` records are waiting or ``flush_interval`` seconds have
+    passed, whichever comes first. Once the file reaches ``max_bytes`` it is
+    rotated to ``<path>.1`` (older files shift up to ``<path>.<backups>``,
+    the oldest is deleted). ``close`` writes whatever is still queued.
+    """
+
+    def __init__(
+        self,
+        path: str = "session_log.jsonl",
+        max_bytes: int = 5 * 1024 * 1024,
+        backups: int = 3,
+        batch_size: int = 32,
+        flush_interval: float = 1.0,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="session-log", daemon=True)
+        self._closed = False
+        self._thread.start()
+
+    def log(self, event: str, **fields: Any) -> None:
+        """Queue one record; never blocks (records are dropped if the writer falls far behind)."""
+        if self._closed:
+            return
+        record = {"time": round(time.time(), 3), "event": event}
+        record.update(fields)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "SessionLogger":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- writer thread --------------------------------------------------------
+
+    def _run(self) -> None:
+        f = None
+        stop = False
+        while not stop:
+            batch: List[Dict[str, Any]] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            if not batch:
+                continue
+            try:
+                if f is None:
+                    f = open(self.path, "a", encoding="utf-8")
+                f.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in batch))
+                f.flush()
+                if self.max_bytes and f.tell() >= self.max_bytes:
+                    f.close()
+                    f = None
+                    self._rotate()
+            except OSError as e:
+                print(f"Session log write failed: {e}")
+        if f is not None:
+            f.close()
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+def stub_answer(messages: List[Dict[str, str]], answer: Optional[str] = None) -> str:
+    if answer is not None:
+        return answer
+    question = messages[-1]["content"].strip() if messages else ""
+    return f"You asked about {question}. Here is a short answer. I hope that helps you practice."
+
+
+class StubLLM:
+    """Local stand-in for the chat backend with controllable latency.
+
+    Streams ``answer`` word by word after ``first_token_delay`` seconds, so
+    the pipeline can be exercised without a network or API key.
+    """
+
+    def __init__(self, answer: Optional[str] = None, first_token_delay: float = 0.3, token_delay: float = 0.02):
+        self.answer = answer
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.requests: List[List[Dict[str, str]]] = []
+
+    async def complete(self, messages: List[Dict[str, str]]) -> str:
+        return "".join([delta async for delta in self.stream(messages)])
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        self.requests.append(messages)
+        await asyncio.sleep(self.first_token_delay)
+        words = stub_answer(messages, self.answer).split(" ")
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self.token_delay)
+            yield word if i == len(words) - 1 else word + " "
+
+
+class StubTTS:
+    """Returns silent 16-bit mono WAV clips sized like real speech."""
+
+    def __init__(self, sample_rate: int = 24000, words_per_second: float = 2.5, synth_delay: float = 0.05):
+        self.sample_rate = sample_rate
+        self.words_per_second = words_per_second
+        self.synth_delay = synth_delay
+
+    def duration(self, text: str) -> float:
+        return max(0.2, len(text.split()) / self.words_per_second)
+
+    async def synthesize(self, text: str) -> bytes:
+        await asyncio.sleep(self.synth_delay)
+        frames = int(self.duration(text) * self.sample_rate)
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"\x00\x00" * frames)
+        return buf.getvalue()
+
+
+class StubChatServer:
+    """OpenAI-compatible ``/v1/chat/completions`` stand-in served on a local port.
+
+    Answers like ``StubLLM`` (streamed as server-sent events when the request
+    asks for ``stream``) with the same latency knobs, over HTTP/1.1
+    keep-alive. The first ``fail_first`` requests get ``fail_status``, so
+    retries and fail-over can be exercised against ``HTTPChat`` without a
+    network or API key. ``requests`` and ``connections`` count what was
+    received, so connection reuse is visible. ``port=0`` picks a free port;
+    see ``url``.
+    """
+
+    def __init__(
+        self,
+        answer: Optional[str] = None,
+        first_token_delay: float = 0.3,
+        token_delay: float = 0.02,
+        fail_first: int = 0,
+        fail_status: int = 503,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.answer = answer
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubChatServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-chat", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubChatServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self.requests <= self.fail_first
+
+
+def _make_handler(stub: StubChatServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            with stub._lock:
+                stub.connections += 1
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+            if stub._should_fail():
+                self._send_json(stub.fail_status, {"error": {"message": "injected failure"}})
+                return
+            text = stub_answer(body.get("messages") or [], stub.answer)
+            model = body.get("model", "stub")
+            time.sleep(stub.first_token_delay)
+            if not body.get("stream"):
+                self._send_json(200, {
+                    "object": "chat.completion",
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                })
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            words = text.split(" ")
+            try:
+                for i, word in enumerate(words):
+                    if i:
+                        time.sleep(stub.token_delay)
+                    delta = word if i == len(words) - 1 else word + " "
+                    chunk = {"object": "chat.completion.chunk", "model": model, "choices": [{"index": 0, "delta": {"content": delta}}]}
+                    self._send_chunk(f"data: {json.dumps(chunk)}\n\n")
+                self._send_chunk("data: [DONE]\n\n")
+                self._send_chunk("")
+            except (BrokenPipeError, ConnectionResetError):
+                # Client hung up mid-answer (barge-in or a lost hedge)
+                self.close_connection = True
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_chunk(self, text: str) -> None:
+            data = text.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve an OpenAI-compatible stub chat endpoint.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer the first N requests with an HTTP 503")
+    args = parser.parse_args()
+    server = StubChatServer(
+        first_token_delay=args.first_token_delay,
+        token_delay=args.token_delay,
+        fail_first=args.fail_first,
+        port=args.port,
+    )
+    print(f"Serving {server.url}/chat/completions")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque
+
+import numpy as np
+
+from .audio import SAMPLE_RATE
+
+
+FULL_SCALE_POWER = 32768.0 ** 2
+
+
+class EnergyVAD:
+    """Frame-level speech/non-speech classifier on raw int16 PCM.
+
+    A frame is speech when its energy rises ``threshold_db`` above a running
+    noise-floor estimate (and above ``min_energy_db``) and its zero-crossing
+    rate stays below ``max_zcr``, which rejects hiss and fan noise. The noise
+    floor follows non-speech frames, so the detector adapts to the room. It
+    also rises to the quietest frame of the last ``floor_window_ms`` whatever
+    the decision was: speech always has gaps, so a window with no quiet frame
+    in it is steady background noise (a hum loud enough to pass for speech
+    would otherwise never be learned).
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        frame_ms: int = 30,
+        threshold_db: float = 9.0,
+        min_energy_db: float = -50.0,
+        max_zcr: float = 0.35,
+        noise_adapt: float = 0.05,
+        floor_window_ms: int = 3000,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.min_energy_db = min_energy_db
+        self.max_zcr = max_zcr
+        self.noise_adapt = noise_adapt
+        self.noise_db = min_energy_db - threshold_db
+        self._recent: Deque[float] = deque(maxlen=max(1, floor_window_ms // frame_ms))
+        self._pending = np.zeros(0, dtype=np.int16)
+
+    def classify(self, pcm: bytes) -> np.ndarray:
+        """Return one boolean per complete frame; leftover samples carry over to the next call."""
+        samples = np.concatenate((self._pending, np.frombuffer(pcm, dtype=np.int16)))
+        n = len(samples) // self.frame_len
+        self._pending = samples[n * self.frame_len:]
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        frames = samples[: n * self.frame_len].reshape(n, self.frame_len).astype(np.float32)
+
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) / FULL_SCALE_POWER + 1e-12)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(self.frame_len - 1)
+
+        speech = np.empty(n, dtype=bool)
+        for i in range(n):
+            self._recent.append(float(energy_db[i]))
+            if len(self._recent) == self._recent.maxlen:
+                self.noise_db = max(self.noise_db, min(self._recent))
+            floor = max(self.noise_db + self.threshold_db, self.min_energy_db)
+            speech[i] = energy_db[i] > floor and zcr[i] < self.max_zcr
+            if not speech[i]:
+                if energy_db[i] < self.noise_db:
+                    self.noise_db = float(energy_db[i])
+                else:
+                    self.noise_db += self.noise_adapt * (float(energy_db[i]) - self.noise_db)
+        return speech
+
+
+@dataclass
+class EndpointResult:
+    audio: bytes  # audio the recognizer should decode for this chunk; empty during silence
+    started: bool = False
+    ended: bool = False
+    trailing_silence_ms: int = 0  # on end: non-speech audio since the last speech frame
+
+    @property
+    def in_speech(self) -> bool:
+        return bool(self.audio)
+
+
+class Endpointer:
+    """Turns VAD frame decisions into utterance boundaries.
+
+    An utterance starts after ``min_speech_ms`` of consecutive speech and
+    ends after ``hangover_ms`` of continuous non-speech, or once it has lasted
+    ``max_utterance_ms`` so that noise the VAD mistakes for speech cannot hold
+    an utterance open forever. Up to ``preroll_ms`` of audio preceding the
+    onset is replayed so the first phoneme is not clipped.
+    """
+
+    def __init__(
+        self,
+        vad: EnergyVAD = None,
+        hangover_ms: int = 600,
+        min_speech_ms: int = 90,
+        preroll_ms: int = 300,
+        max_utterance_ms: int = 15000,
+    ):
+        self.vad = vad or EnergyVAD()
+        self.hangover_ms = hangover_ms
+        self.min_speech_ms = min_speech_ms
+        self.preroll_ms = preroll_ms
+        self.max_utterance_ms = max_utterance_ms
+        self.in_speech = False
+        self._speech_run = 0
+        self._utterance_ms = 0
+        self._silence_run = 0
+        self._preroll: Deque[bytes] = deque()
+        self._preroll_bytes = 0
+
+    def process(self, chunk: bytes) -> EndpointResult:
+        frames = self.vad.classify(chunk)
+        frame_ms = self.vad.frame_ms
+        started = ended = False
+        trailing_ms = 0
+        for i, is_speech in enumerate(frames):
+            if not self.in_speech:
+                self._speech_run = self._speech_run + frame_ms if is_speech else 0
+                if self._speech_run >= self.min_speech_ms:
+                    self.in_speech = started = True
+                    self._silence_run = 0
+                    self._utterance_ms = self._speech_run
+            elif not ended:
+                self._silence_run = 0 if is_speech else self._silence_run + frame_ms
+                self._utterance_ms += frame_ms
+                if self._silence_run >= self.hangover_ms or self._utterance_ms >= self.max_utterance_ms:
+                    ended = True
+                    trailing_ms = self._silence_run + (len(frames) - 1 - i) * frame_ms
+
+        if ended:
+            self.in_speech = False
+            self._speech_run = 0
+            return EndpointResult(chunk, started=started, ended=True, trailing_silence_ms=trailing_ms)
+        if started:
+            audio = b"".join(self._preroll) + chunk
+            self._preroll.clear()
+            self._preroll_bytes = 0
+            return EndpointResult(audio, started=True)
+        if self.in_speech:
+            return EndpointResult(chunk)
+        self._remember(chunk)
+        return EndpointResult(b"")
+
+    def _remember(self, chunk: bytes) -> None:
+        limit = self.vad.sample_rate * 2 * self.preroll_ms // 1000
+        self._preroll.append(chunk)
+        self._preroll_bytes += len(chunk)
+        while len(self._preroll) > 1 and self._preroll_bytes - len(self._preroll[0]) >= limit:
+            self._preroll_bytes -= len(self._preroll.popleft())
@@ -0,0 +1,112 @@
+"""Sentiment overhead on a long transcript.
+
+Usage (from the flashfoundry directory)::
+
+    python benchmarks/sentiment_overhead.py [--lines 8000] [--budget 0.20]
+
+Builds a synthetic multi-hour transcript from caption-like lines (repeats
+included, as in real captions), then times phrase + highlight detection
+and product suggestions with the sentiment signal switched off
+(``sentiment_weight=0``, the detectors as they were before it existed)
+against the same pipeline with the sentiment stage computed from a cold
+cache. Exits non-zero if the sentiment stage adds more than ``--budget`` to
+the total.
+
+The cost depends on the analyzer: VADER when NLTK's ``vader_lexicon`` is
+installed, otherwise the much cheaper built-in lexicon. The report says
+which one was measured.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flashfoundry import sentiment  # noqa: E402
+from flashfoundry.highlight_detector import detect_highlights  # noqa: E402
+from flashfoundry.phrase_detector import detect_hot_phrases  # noqa: E402
+from flashfoundry.product_suggester import suggest_products  # noqa: E402
+from flashfoundry.youtube_utils import TranscriptLine  # noqa: E402
+
+
+OPENERS = ["no way chat", "okay okay", "let's go", "wait what", "bro", "honestly", "yo", "guys"]
+MIDDLES = [
+	"this is actually working", "we just pulled it off", "that was so bad", "big brain moves",
+	"I love this game", "this boss is terrible", "the new update is insane", "I can't believe it",
+	"focus focus", "that jump was clutch", "we lost again", "what a beautiful shot",
+]
+ENDINGS = ["", "haha", "lol", "!!", "rip", "GG", "for real", "no cap"]
+
+
+def synthetic_transcript(n_lines: int, seed: int = 7) -> List[TranscriptLine]:
+	rng = random.Random(seed)
+	lines: List[TranscriptLine] = []
+	t = 0.0
+	for _ in range(n_lines):
+		text = " ".join(p for p in (rng.choice(OPENERS), rng.choice(MIDDLES), rng.choice(ENDINGS)) if p)
+		if rng.random() < 0.1:
+			text = text.upper()
+		duration = rng.uniform(1.5, 5.0)
+		lines.append(TranscriptLine(start=round(t, 2), duration=round(duration, 2), text=text))
+		t += duration
+	return lines
+
+
+def best_of(repeats: int, *fns: Callable[[], None]) -> List[float]:
+	"""Fastest run of each of ``fns``; runs are interleaved so machine drift hits all of them alike."""
+	best = [float("inf")] * len(fns)
+	for _ in range(repeats):
+		for i, fn in enumerate(fns):
+			started = time.perf_counter()
+			fn()
+			best[i] = min(best[i], time.perf_counter() - started)
+	return best
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--lines", type=int, default=8000)
+	parser.add_argument("--repeats", type=int, default=5)
+	parser.add_argument("--budget", type=float, default=0.20, help="Largest allowed overhead as a fraction of the baseline")
+	args = parser.parse_args()
+
+	transcript = synthetic_transcript(args.lines)
+
+	def without_sentiment() -> None:
+		phrases = detect_hot_phrases(transcript, sentiment_weight=0)
+		detect_highlights(transcript, window_seconds=30, sentiment_weight=0)
+		suggest_products(phrases, top_k=30)
+
+	def with_sentiment() -> None:
+		sentiment.score_text.cache_clear()
+		scores = sentiment.line_sentiments(transcript)
+		phrases = detect_hot_phrases(transcript, sentiments=scores)
+		detect_highlights(transcript, window_seconds=30, sentiments=scores)
+		suggest_products(phrases, top_k=30)
+
+	# Warm up stopwords and the sentiment analyzer so neither side pays one-off loading
+	without_sentiment()
+	sentiment.line_sentiments(transcript[:10])
+
+	baseline, full = best_of(args.repeats, without_sentiment, with_sentiment)
+	(stage,) = best_of(args.repeats, lambda: (sentiment.score_text.cache_clear(), sentiment.line_sentiments(transcript)))
+	overhead = (full - baseline) / baseline
+	unique = len({sentiment.normalize_line(line.text) for line in transcript})
+	analyzer = "VADER" if sentiment._vader() is not None else "built-in lexicon (VADER unavailable; its overhead is not measured)"
+
+	print(f"lines              {len(transcript)} ({unique} unique, {transcript[-1].start / 3600:.1f} h)")
+	print(f"analyzer           {analyzer}")
+	print(f"without sentiment  {baseline * 1000:.1f} ms")
+	print(f"with sentiment     {full * 1000:.1f} ms (sentiment stage {stage * 1000:.1f} ms, cold cache)")
+	print(f"overhead           {overhead:.1%} (budget {args.budget:.0%}); the stage alone is {stage / baseline:.1%}")
+	if overhead > args.budget:
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,118 @@
+"""Startup cost of the flashfoundry CLI, measured with ``python -X importtime``.
+
+Usage (from the flashfoundry directory)::
+
+    python benchmarks/startup_importtime.py [--runs 5] [--budget-ms 75]
+
+Two checks, each in fresh interpreters:
+
+- ``import flashfoundry.cli``: the median cumulative import time must stay
+  under ``--budget-ms``, and none of the heavy optional dependencies may be
+  loaded (they belong in the code paths that use them).
+- a full run on ``samples/sample_transcript.json``: the YouTube client,
+  vosk and tqdm must not be imported on the local-transcript path.
+
+Prints the slowest imports of the last run and exits non-zero on any
+violation.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported just to start the CLI
+HEAVY_MODULES = ["rich", "tqdm", "rapidfuzz", "nltk", "youtube_transcript_api", "requests", "typer", "vosk"]
+# Must not be imported when analysing a local transcript file
+NOT_FOR_LOCAL_TRANSCRIPT = ["youtube_transcript_api", "vosk", "tqdm"]
+
+
+def importtime(args: List[str]) -> Tuple[Dict[str, Dict[str, int]], Set[str]]:
+	"""Run ``python -X importtime <args>``.
+
+	Returns, for every top-level import, its cumulative µs and those of its direct
+	imports (``{name: {name: total, child: total, ...}}``), plus all module names.
+	"""
+	proc = subprocess.run(
+		[sys.executable, "-X", "importtime", *args],
+		cwd=ROOT,
+		capture_output=True,
+		text=True,
+	)
+	if proc.returncode != 0:
+		sys.stderr.write(proc.stderr[-2000:])
+		raise SystemExit(f"command failed: {' '.join(args)}")
+	top: Dict[str, Dict[str, int]] = {}
+	modules: Set[str] = set()
+	children: Dict[str, int] = {}
+	for line in proc.stderr.splitlines():
+		if not line.startswith("import time:") or "cumulative" in line:
+			continue
+		_, cumulative, field = line[len("import time:"):].split("|")
+		name = field.strip()
+		depth = (len(field) - len(field.lstrip()) - 1) // 2
+		modules.add(name)
+		# importtime lists a module's imports before the module itself
+		if depth == 1:
+			children[name] = int(cumulative)
+		elif depth == 0:
+			top[name] = {name: int(cumulative), **children}
+			children = {}
+	return top, modules
+
+
+def loaded(modules: Set[str], packages: List[str]) -> List[str]:
+	return [p for p in packages if any(m == p or m.startswith(p + ".") for m in modules)]
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--runs", type=int, default=5)
+	parser.add_argument("--budget-ms", type=float, default=75.0, help="Largest allowed median import time of flashfoundry.cli")
+	args = parser.parse_args()
+	failures: List[str] = []
+
+	samples = []
+	for _ in range(args.runs):
+		top, modules = importtime(["-c", "import flashfoundry.cli"])
+		cli = top["flashfoundry.cli"]
+		samples.append(cli["flashfoundry.cli"] / 1000.0)
+	median_ms = statistics.median(samples)
+	print(f"import flashfoundry.cli   median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+	if median_ms > args.budget_ms:
+		failures.append(f"import time {median_ms:.1f} ms exceeds {args.budget_ms:.0f} ms")
+	heavy = loaded(modules, HEAVY_MODULES)
+	if heavy:
+		failures.append(f"imported at startup: {', '.join(heavy)}")
+
+	with tempfile.TemporaryDirectory() as out:
+		_, run_modules = importtime([
+			"-m", "flashfoundry.cli",
+			"--url", "sample_video",
+			"--transcript-file", os.path.join("samples", "sample_transcript.json"),
+			"--out", out,
+		])
+	unexpected = loaded(run_modules, NOT_FOR_LOCAL_TRANSCRIPT)
+	print(f"local transcript run      imported {len(run_modules)} modules; {', '.join(unexpected) or 'no YouTube client, vosk or tqdm'}")
+	if unexpected:
+		failures.append(f"imported for a local transcript: {', '.join(unexpected)}")
+
+	print("slowest direct imports of flashfoundry.cli (cumulative, last run):")
+	cli.pop("flashfoundry.cli")
+	for name, us in sorted(cli.items(), key=lambda kv: -kv[1])[:8]:
+		print(f"  {us / 1000.0:8.1f} ms  {name}")
+
+	for failure in failures:
+		print(f"FAIL: {failure}")
+	if failures:
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
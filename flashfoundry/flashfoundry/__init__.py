@@ -6,4 +6,6 @@ __all__ = [
 	"product_suggester",
 	"export_utils",
 	"text_utils",
+	"sentiment",
+	"stt",
 ]
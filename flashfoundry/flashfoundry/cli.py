@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 import os
-from pathlib import Path
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Tuple
 
-import typer
-from rich.console import Console
-from rich.table import Table
-from tqdm import tqdm
+import click
 
-from .youtube_utils import fetch_transcript, load_transcript_from_file, extract_video_id
+# Heavy optional dependencies (rich, tqdm, rapidfuzz, NLTK, youtube_transcript_api,
+# vosk) are imported inside the code paths that use them, so starting the CLI
+# (or running it on a local --transcript-file) stays cheap. See
+# benchmarks/startup_importtime.py for the budget.
+from .youtube_utils import TranscriptLine, fetch_transcript, load_transcript_from_file, extract_video_id
 from .phrase_detector import detect_hot_phrases
 from .highlight_detector import detect_highlights
+from .sentiment import line_sentiments
 from .product_suggester import suggest_products
 from .export_utils import (
 	ensure_dir,
@@ -20,39 +22,64 @@ from .export_utils import (
 	export_highlights_csv,
 	export_products_csv,
 	export_report_json,
+	export_transcript_json,
 )
 
 
-app = typer.Typer(add_completion=False)
-console = Console()
+@lru_cache(maxsize=1)
+def get_console():
+	from rich.console import Console
 
+	return Console()
 
-@app.command()
+
+@click.command(context_settings={"show_default": True})
+@click.option("--url", multiple=True, required=True, show_default=False, help="YouTube video URL(s) or ID(s)")
+@click.option("--out", default="out", help="Output directory")
+@click.option("--transcript-file", default=None, help="Optional local transcript file (.json/.srt/.vtt)")
+@click.option("--audio-file", default=None, help="Local audio/video file to transcribe offline with Vosk")
+@click.option("--vosk-model", default=None, help="Vosk model directory used with --audio-file")
+@click.option("--stt-workers", default=0, help="Processes decoding --audio-file in parallel, each with its own copy of the model (0 = up to 4)")
+@click.option("--language", default="en", help="Stopword language code")
+@click.option("--window-seconds", default=60, help="Window size for phrase detection")
+@click.option("--top-k", default=30, help="Number of top phrases to export")
 def main(
-	url: List[str] = typer.Option(..., "--url", help="YouTube video URL(s) or ID(s)", show_default=False),
-	out: str = typer.Option("out", help="Output directory"),
-	transcript_file: Optional[str] = typer.Option(None, help="Optional local transcript file (.json/.srt/.vtt)"),
-	language: str = typer.Option("en", help="Stopword language code"),
-	window_seconds: int = typer.Option(60, help="Window size for phrase detection"),
-	top_k: int = typer.Option(30, help="Number of top phrases to export"),
+	url: Tuple[str, ...],
+	out: str,
+	transcript_file: Optional[str],
+	audio_file: Optional[str],
+	vosk_model: Optional[str],
+	stt_workers: int,
+	language: str,
+	window_seconds: int,
+	top_k: int,
 ):
 	"""Analyze YouTube videos to extract hot phrases, highlights and product ideas."""
+	from rich.table import Table
+
+	if audio_file and not vosk_model:
+		raise click.BadParameter("--audio-file needs --vosk-model")
+	console = get_console()
 	for u in url:
 		video_id = extract_video_id(u)
 		console.rule(f"[bold]Analyzing {video_id}")
+		out_dir = os.path.join(out, video_id)
 		if transcript_file:
 			transcript = load_transcript_from_file(transcript_file)
+		elif audio_file:
+			ensure_dir(out_dir)
+			transcript = transcribe_audio(audio_file, vosk_model, stt_workers, os.path.join(out_dir, "transcript.json"))
 		else:
 			transcript = fetch_transcript(u)
 		if not transcript:
 			console.print(f"[red]No transcript available for {video_id}. Skipping.")
 			continue
 
-		phrases = detect_hot_phrases(transcript, window_seconds=window_seconds, language=language)
-		highlights = detect_highlights(transcript, window_seconds=30)
+		sentiments = line_sentiments(transcript)
+		phrases = detect_hot_phrases(transcript, window_seconds=window_seconds, language=language, sentiments=sentiments)
+		highlights = detect_highlights(transcript, window_seconds=30, sentiments=sentiments)
 		ideas = suggest_products(phrases, top_k=top_k)
 
-		out_dir = os.path.join(out, video_id)
 		ensure_dir(out_dir)
 		export_phrases_csv(os.path.join(out_dir, "phrases.csv"), phrases[:top_k])
 		export_highlights_csv(os.path.join(out_dir, "highlights.csv"), highlights)
@@ -80,6 +107,27 @@ def main(
 		console.print(table2)
 
 
+def transcribe_audio(path: str, model_path: str, workers: int, transcript_path: str) -> List[TranscriptLine]:
+	"""Run offline STT on ``path``, saving the transcript so later runs can pass it as --transcript-file."""
+	from tqdm import tqdm
+
+	from .stt import TranscriptionStats, transcribe_file
+
+	stats = TranscriptionStats()
+	transcript: List[TranscriptLine] = []
+	with tqdm(desc="Transcribing", unit="s", bar_format="{desc}: {n:.0f}s of audio [{elapsed}{postfix}]") as bar:
+		for line in transcribe_file(path, model_path, workers=workers or None, stats=stats):
+			transcript.append(line)
+			bar.update(max(0.0, line.start + line.duration - bar.n))
+			bar.set_postfix_str(f"RTF {stats.real_time_factor:.2f}")
+	export_transcript_json(transcript_path, transcript)
+	get_console().print(
+		f"Transcribed {stats.audio_seconds:.0f}s of audio in {stats.wall_seconds:.1f}s "
+		f"(real-time factor {stats.real_time_factor:.3f}, {stats.chunks} chunks)"
+	)
+	return transcript
+
+
 if __name__ == "__main__":
-	app()
+	main()
 
@@ -9,6 +9,7 @@ from typing import Iterable, List
 from .phrase_detector import PhraseHit
 from .highlight_detector import Highlight
 from .product_suggester import ProductIdea
+from .youtube_utils import TranscriptLine
 
 
 def ensure_dir(path: str) -> None:
@@ -57,3 +58,9 @@ def export_report_json(path: str, phrases: List[PhraseHit], highlights: List[Hig
 	with open(path, "w", encoding="utf-8") as f:
 		json.dump(data, f, ensure_ascii=False, indent=2)
 
+
+
+def export_transcript_json(path: str, transcript: Iterable[TranscriptLine]) -> None:
+	"""Write lines in the JSON format ``load_transcript_from_file`` reads."""
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump([asdict(line) for line in transcript], f, ensure_ascii=False, indent=2)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 import math
 
 from .youtube_utils import TranscriptLine
+from .sentiment import ensure_sentiments
 from .text_utils import tokenize
 
 
@@ -17,16 +18,29 @@ class Highlight:
 	reason: str
 
 
-def detect_highlights(transcript: List[TranscriptLine], window_seconds: int = 30) -> List[Highlight]:
+def detect_highlights(
+	transcript: List[TranscriptLine],
+	window_seconds: int = 30,
+	sentiments: Optional[List[float]] = None,
+	sentiment_weight: float = 0.15,
+) -> List[Highlight]:
 	"""Detect highlight-worthy segments using transcript dynamics.
 
 	Heuristics (no paid models):
 	- word rate spikes
 	- exclamation/intensity marks
 	- sentiment proxies: uppercase ratio, laugher tokens (lol, haha), emphasis
+	- sentiment spikes: summed per-line sentiment intensity (|compound|)
+
+	``sentiments`` are per-line scores from ``sentiment.line_sentiments``; they are
+	computed here when not given. ``sentiment_weight`` is the weight of the
+	sentiment z-score; 0 leaves sentiment out entirely (nothing is scored).
 	"""
 	if not transcript:
 		return []
+	use_sentiment = sentiment_weight != 0
+	if use_sentiment:
+		sentiments = ensure_sentiments(transcript, sentiments)
 
 	# Build windows
 	total_time = transcript[-1].start + transcript[-1].duration
@@ -35,12 +49,15 @@ def detect_highlights(transcript: List[TranscriptLine], window_seconds: int = 30
 	exclaim_rates = [0.0] * n_windows
 	upper_rates = [0.0] * n_windows
 	laugh_rates = [0.0] * n_windows
+	sentiment_rates = [0.0] * n_windows
 
 	def widx(ts: float) -> int:
 		return min(n_windows - 1, int(ts // window_seconds))
 
-	for line in transcript:
+	for i, line in enumerate(transcript):
 		idx = widx(line.start)
+		if use_sentiment:
+			sentiment_rates[idx] += abs(sentiments[i])
 		toks = tokenize(line.text)
 		word_rates[idx] += len(toks) / max(1e-6, line.duration or 1.0)
 		exclaim_rates[idx] += line.text.count("!")
@@ -59,8 +76,9 @@ def detect_highlights(transcript: List[TranscriptLine], window_seconds: int = 30
 	exz = zscore(exclaim_rates)
 	uz = zscore(upper_rates)
 	lz = zscore(laugh_rates)
+	sz = zscore(sentiment_rates) if use_sentiment else [0.0] * n_windows
 
-	scores = [0.5 * wz[i] + 0.2 * exz[i] + 0.2 * uz[i] + 0.1 * lz[i] for i in range(n_windows)]
+	scores = [0.5 * wz[i] + 0.2 * exz[i] + 0.2 * uz[i] + 0.1 * lz[i] + sentiment_weight * sz[i] for i in range(n_windows)]
 
 	# Adaptive threshold: keep windows above max(0.8, 85th percentile)
 	sorted_scores = sorted(scores)
@@ -74,6 +92,8 @@ def detect_highlights(transcript: List[TranscriptLine], window_seconds: int = 30
 			start = i * window_seconds
 			end = min(total_time, start + window_seconds)
 			reason = f"word-rate:{wz[i]:.2f}, exclaim:{exz[i]:.2f}, upper:{uz[i]:.2f}"
+			if use_sentiment:
+				reason += f", sentiment:{sz[i]:.2f}"
 			highlights.append(Highlight(start=start, end=end, score=float(s), reason=reason))
 
 	# sort by score desc
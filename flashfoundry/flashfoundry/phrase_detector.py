@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import math
 from collections import defaultdict
-from rapidfuzz import fuzz
+from itertools import repeat
 
+from .sentiment import ensure_sentiments
 from .text_utils import tokenize, generate_ngrams, filter_ngrams, get_stopwords
 from .youtube_utils import TranscriptLine
 
@@ -31,6 +32,8 @@ def detect_hot_phrases(
 	n_min: int = 1,
 	n_max: int = 3,
 	min_count: int = 2,
+	sentiments: Optional[List[float]] = None,
+	sentiment_weight: float = 1.0,
 ) -> List[PhraseHit]:
 	"""Detect hot phrases with novelty by time-window.
 
@@ -38,24 +41,38 @@ def detect_hot_phrases(
 	- frequency within a window
 	- cross-window novelty (peaks vs history)
 	- length bonus for 2–3 grams
+	- sentiment bonus from the mean sentiment of the lines the phrase was said in
+	  (positive phrases favored, strong negative ones kept)
+
+	``sentiments`` are per-line scores from ``sentiment.line_sentiments``; they are
+	computed here when not given. ``sentiment_weight`` scales the bonus; 0 leaves
+	sentiment out entirely (nothing is scored).
 	"""
 	stop = get_stopwords(language)
+	use_sentiment = sentiment_weight != 0
+	line_scores = ensure_sentiments(transcript, sentiments) if use_sentiment else repeat(0.0)
 	window_to_phrase_counts: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
 	phrase_global_counts: Dict[str, int] = defaultdict(int)
+	window_to_phrase_sentiment: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
 	phrase_first_seen: Dict[str, float] = {}
 
-	for line in transcript:
+	for line, sentiment in zip(transcript, line_scores):
 		tokens = [t for t in tokenize(line.text) if t]
 		if not tokens:
 			continue
 		ngrams = generate_ngrams(tokens, n_min=n_min, n_max=n_max)
 		ngrams = filter_ngrams(ngrams, stop)
 		widx = _window_index(line.start, window_seconds)
+		counts = window_to_phrase_counts[widx]
 		for ng in ngrams:
-			window_to_phrase_counts[widx][ng] += 1
+			counts[ng] += 1
 			phrase_global_counts[ng] += 1
 			if ng not in phrase_first_seen:
 				phrase_first_seen[ng] = line.start
+		if sentiment:
+			sentiment_sums = window_to_phrase_sentiment[widx]
+			for ng in ngrams:
+				sentiment_sums[ng] += sentiment
 
 	# Compute novelty score per phrase per window
 	phrase_hits: List[PhraseHit] = []
@@ -69,7 +86,11 @@ def detect_hot_phrases(
 			# Novelty: current vs historical average
 			novelty = c - mean_hist
 			length_bonus = 1.0 + 0.2 * (len(phrase.split()) - 1)
-			score = (c * 1.0 + novelty * 0.8) * length_bonus
+			sentiment_bonus = 1.0
+			if use_sentiment:
+				mean_sentiment = window_to_phrase_sentiment[widx].get(phrase, 0.0) / c
+				sentiment_bonus += sentiment_weight * (0.25 * abs(mean_sentiment) + 0.15 * max(0.0, mean_sentiment))
+			score = (c * 1.0 + novelty * 0.8) * length_bonus * sentiment_bonus
 			start_time = widx * window_seconds
 			end_time = start_time + window_seconds
 			phrase_hits.append(PhraseHit(phrase=phrase, start=start_time, end=end_time, score=score, count=c))
@@ -86,6 +107,8 @@ def detect_hot_phrases(
 	results.sort(key=lambda h: (-h.score, phrase_first_seen.get(h.phrase, math.inf)))
 
 	# Merge near-duplicate phrases (spacing/punctuation variants)
+	from rapidfuzz import fuzz
+
 	merged: List[PhraseHit] = []
 	for hit in results:
 		merged_into = False
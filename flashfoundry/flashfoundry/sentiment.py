@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from .text_utils import TOKEN_RE
+from .youtube_utils import TranscriptLine
+
+
+# Fallback lexicon used when NLTK's VADER (and its lexicon) is unavailable
+POSITIVE_WORDS = {
+	"amazing", "awesome", "beautiful", "best", "brilliant", "clutch", "cool", "cute", "epic", "excellent",
+	"fantastic", "fire", "fun", "funny", "glad", "good", "great", "happy", "hilarious", "hype",
+	"incredible", "insane", "legendary", "love", "lovely", "nice", "perfect", "pog", "poggers", "super",
+	"sweet", "win", "won", "wonderful", "wow", "yes", "yay", "gg", "goat", "haha", "lol", "lmao",
+}
+NEGATIVE_WORDS = {
+	"angry", "annoying", "awful", "bad", "boring", "broke", "broken", "cringe", "dead", "died",
+	"fail", "failed", "hate", "horrible", "lost", "lose", "mad", "pain", "rip", "sad",
+	"scary", "sucks", "terrible", "trash", "ugh", "worst", "wrong", "noo", "nooo", "oof",
+}
+NEGATIONS = {"not", "no", "never", "dont", "don't", "cant", "can't", "isnt", "isn't", "wasnt", "wasn't", "aint", "ain't"}
+INTENSIFIERS = {"so", "very", "really", "super", "extremely", "totally", "literally", "absolutely"}
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1)
+def _vader():
+	"""NLTK's VADER analyzer, or None if NLTK or the lexicon can't be loaded."""
+	try:
+		from nltk import download as nltk_download
+		from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+		try:
+			return SentimentIntensityAnalyzer()
+		except LookupError:
+			nltk_download("vader_lexicon", quiet=True)
+			return SentimentIntensityAnalyzer()
+	except Exception:
+		return None
+
+
+def _lexicon_score(text: str) -> float:
+	"""VADER-like compound score in [-1, 1] from the small built-in lexicon."""
+	tokens = TOKEN_RE.findall(text.lower())
+	total = 0.0
+	for i, tok in enumerate(tokens):
+		value = 1.0 if tok in POSITIVE_WORDS else -1.0 if tok in NEGATIVE_WORDS else 0.0
+		if not value:
+			continue
+		if i and tokens[i - 1] in INTENSIFIERS:
+			value *= 1.3
+		if any(t in NEGATIONS for t in tokens[max(0, i - 3) : i]):
+			value *= -0.75
+		total += value
+	if total:
+		total += math.copysign(min(text.count("!"), 4) * 0.3, total)
+	return total / math.sqrt(total * total + 15.0)
+
+
+@lru_cache(maxsize=65536)
+def score_text(text: str) -> float:
+	"""Compound sentiment of already-normalized ``text`` (memoized: captions repeat a lot)."""
+	analyzer = _vader()
+	if analyzer is not None:
+		return float(analyzer.polarity_scores(text)["compound"])
+	return _lexicon_score(text)
+
+
+def normalize_line(text: str) -> str:
+	# Case and punctuation are kept: VADER scores capitals and "!" as emphasis
+	return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def line_sentiments(transcript: Iterable[TranscriptLine]) -> List[float]:
+	"""Compound sentiment in [-1, 1] for every line, aligned with ``transcript``."""
+	return [score_text(normalize_line(line.text)) for line in transcript]
+
+
+def ensure_sentiments(transcript: List[TranscriptLine], sentiments: Optional[List[float]]) -> List[float]:
+	if sentiments is None:
+		return line_sentiments(transcript)
+	if len(sentiments) != len(transcript):
+		raise ValueError("sentiments must have one value per transcript line")
+	return sentiments
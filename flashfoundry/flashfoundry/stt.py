@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import wave
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Iterator, List, Optional, Tuple
+
+from .youtube_utils import TranscriptLine
+
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+# Vosk decodes in blocks of this many bytes (0.25 s)
+FEED_BYTES = 8000
+
+# Every worker process loads its own copy of the model: tens of MB for the small
+# Vosk models, several GB for the large ones, so only a few run by default
+DEFAULT_MAX_WORKERS = 4
+
+Word = Tuple[float, float, str]
+
+
+@dataclass
+class TranscriptionStats:
+	audio_seconds: float = 0.0
+	wall_seconds: float = 0.0
+	decode_seconds: float = 0.0
+	chunks: int = 0
+
+	@property
+	def real_time_factor(self) -> float:
+		"""Wall-clock seconds per second of audio (below 1.0 is faster than real time)."""
+		return self.wall_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+
+def transcribe_file(
+	path: str,
+	model_path: str,
+	chunk_seconds: float = 30.0,
+	workers: Optional[int] = None,
+	max_words: int = 12,
+	stats: Optional[TranscriptionStats] = None,
+) -> Iterator[TranscriptLine]:
+	"""Transcribe a local audio/video file offline with Vosk, yielding lines in order.
+
+	The audio is converted to 16 kHz mono PCM (directly for such WAV files,
+	otherwise through ``ffmpeg``) and cut into ``chunk_seconds`` chunks at
+	the quietest point near each boundary so words are not split. Chunks are
+	decoded in parallel by ``workers`` processes (default: up to
+	``DEFAULT_MAX_WORKERS``), each loading its own copy of the model, so
+	memory grows with the worker count; lines are yielded as soon as every
+	earlier chunk is done.
+	Each recognized utterance becomes one or more lines of at most
+	``max_words`` words, timed from Vosk's word timestamps. Pass ``stats``
+	to follow audio length, wall time and the real-time factor.
+	"""
+	stats = stats if stats is not None else TranscriptionStats()
+	workers = workers or default_workers()
+	started = time.perf_counter()
+	pending: Deque[Future] = deque()
+	with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+		try:
+			for offset, pcm in _split_chunks(_read_pcm(path), chunk_seconds):
+				stats.audio_seconds += len(pcm) / BYTES_PER_SECOND
+				stats.chunks += 1
+				pending.append(pool.submit(_decode_chunk, offset, pcm))
+				# Keep at most two chunks per worker in flight; emit finished ones early
+				while pending and (len(pending) > 2 * workers or pending[0].done()):
+					yield from _chunk_lines(pending.popleft(), max_words, stats, started)
+			while pending:
+				yield from _chunk_lines(pending.popleft(), max_words, stats, started)
+		finally:
+			for future in pending:
+				future.cancel()
+
+
+def default_workers() -> int:
+	return min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+
+
+def _chunk_lines(future: Future, max_words: int, stats: TranscriptionStats, started: float) -> Iterator[TranscriptLine]:
+	utterances, decode_seconds = future.result()
+	stats.decode_seconds += decode_seconds
+	stats.wall_seconds = time.perf_counter() - started
+	for words in utterances:
+		for i in range(0, len(words), max_words):
+			group = words[i : i + max_words]
+			yield TranscriptLine(
+				start=round(group[0][0], 2),
+				duration=round(group[-1][1] - group[0][0], 2),
+				text=" ".join(w for _, _, w in group),
+			)
+
+
+def _read_pcm(path: str, block_seconds: float = 10.0) -> Iterator[bytes]:
+	"""16 kHz mono 16-bit PCM of ``path`` in blocks."""
+	block = int(block_seconds * BYTES_PER_SECOND)
+	if path.lower().endswith(".wav"):
+		with wave.open(path, "rb") as wav:
+			if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) == (SAMPLE_RATE, 1, 2):
+				while True:
+					data = wav.readframes(block // 2)
+					if not data:
+						return
+					yield data
+	ffmpeg = shutil.which("ffmpeg")
+	if ffmpeg is None:
+		raise RuntimeError("ffmpeg is required to transcribe anything but 16 kHz mono WAV files")
+	cmd = [ffmpeg, "-nostdin", "-loglevel", "error", "-i", path, "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"]
+	proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+	try:
+		assert proc.stdout is not None
+		while True:
+			data = proc.stdout.read(block)
+			if not data:
+				break
+			yield data
+	finally:
+		proc.kill()
+		proc.wait()
+	if proc.returncode not in (0, -9):
+		raise RuntimeError(f"ffmpeg failed to decode {path}")
+
+
+def _split_chunks(blocks: Iterator[bytes], chunk_seconds: float, search_seconds: float = 2.0) -> Iterator[Tuple[float, bytes]]:
+	"""Regroup PCM blocks into ~``chunk_seconds`` chunks cut at a quiet point; yields (offset seconds, pcm)."""
+	target = int(chunk_seconds * BYTES_PER_SECOND) & ~1
+	search = min(target // 2, int(search_seconds * BYTES_PER_SECOND)) & ~1
+	buf = bytearray()
+	offset = 0
+	for data in blocks:
+		buf += data
+		while len(buf) >= target:
+			cut = _quietest_cut(buf, target - search, target)
+			yield offset / BYTES_PER_SECOND, bytes(buf[:cut])
+			offset += cut
+			del buf[:cut]
+	if buf:
+		yield offset / BYTES_PER_SECOND, bytes(buf)
+
+
+def _quietest_cut(buf: bytearray, lo: int, hi: int, frame_ms: int = 50) -> int:
+	"""Byte offset in [lo, hi) at the centre of the lowest-energy frame."""
+	samples = array("h")
+	samples.frombytes(bytes(buf[lo:hi]))
+	if sys.byteorder == "big":
+		samples.byteswap()
+	step = SAMPLE_RATE * frame_ms // 1000
+	best_i, best = 0, None
+	for i in range(0, len(samples) - step + 1, step):
+		energy = sum(map(abs, samples[i : i + step]))
+		if best is None or energy < best:
+			best_i, best = i, energy
+	if best is None:
+		return hi
+	return lo + (best_i + step // 2) * 2
+
+
+# -- worker processes --------------------------------------------------------
+
+_worker_model: Any = None
+
+
+def _init_worker(model_path: str) -> None:
+	global _worker_model
+	from vosk import Model, SetLogLevel
+
+	SetLogLevel(-1)
+	_worker_model = Model(model_path)
+
+
+def _decode_chunk(offset: float, pcm: bytes) -> Tuple[List[List[Word]], float]:
+	"""Word-timed utterances of one chunk, shifted by ``offset`` seconds, and the decode time."""
+	from vosk import KaldiRecognizer
+
+	started = time.perf_counter()
+	recognizer = KaldiRecognizer(_worker_model, SAMPLE_RATE)
+	recognizer.SetWords(True)
+	utterances: List[List[Word]] = []
+
+	def collect(result: str) -> None:
+		words = json.loads(result).get("result") or []
+		if words:
+			utterances.append([(offset + w["start"], offset + w["end"], w["word"]) for w in words])
+
+	for i in range(0, len(pcm), FEED_BYTES):
+		if recognizer.AcceptWaveform(pcm[i : i + FEED_BYTES]):
+			collect(recognizer.Result())
+	collect(recognizer.FinalResult())
+	return utterances, time.perf_counter() - started
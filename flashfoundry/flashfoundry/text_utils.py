@@ -1,15 +1,11 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Iterable, List
 
-try:
-	from nltk.corpus import stopwords as nltk_stopwords
-	from nltk import download as nltk_download
-	excepted = False
-except Exception:
-	excepted = True
-	nltk_stopwords = None  # type: ignore
+# Set once NLTK turns out to be unusable, so later calls go straight to the fallback
+excepted = False
 
 
 DEFAULT_STOPWORDS = set(
@@ -48,9 +44,12 @@ DEFAULT_STOPWORDS = set(
 )
 
 
+@lru_cache(maxsize=None)
 def get_stopwords(language: str = "en") -> set:
 	"""Return a stopword set. Tries NLTK; falls back to a small default set.
 
+	NLTK (slow to import) is only loaded here, and the result is cached per language.
+
 	Parameters
 	----------
 	language: str
@@ -59,8 +58,11 @@ def get_stopwords(language: str = "en") -> set:
 	global excepted
 	if not excepted:
 		try:
+			from nltk.corpus import stopwords as nltk_stopwords
+			from nltk import download as nltk_download
+
 			nltk_download("stopwords", quiet=True)
-			return set(nltk_stopwords.words(language))  # type: ignore
+			return set(nltk_stopwords.words(language))
 		except Exception:
 			excepted = True
 			# fall through
@@ -5,8 +5,6 @@ import re
 from dataclasses import dataclass
 from typing import List, Optional
 
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
-
 
 YOUTUBE_ID_RE = re.compile(r"(?:v=|youtu\.be/|/shorts/)([A-Za-z0-9_-]{6,})")
 
@@ -26,6 +24,9 @@ def extract_video_id(url_or_id: str) -> str:
 
 
 def fetch_transcript(video_id_or_url: str, languages: Optional[List[str]] = None) -> List[TranscriptLine]:
+	# Imported here: pulls in requests and is not needed for local transcripts
+	from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
+
 	video_id = extract_video_id(video_id_or_url)
 	languages = languages or ["en", "en-US", "en-GB", "auto"]
 	try:
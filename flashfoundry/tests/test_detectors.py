@@ -0,0 +1,42 @@
+import pytest
+
+from flashfoundry import highlight_detector, phrase_detector
+from flashfoundry.youtube_utils import TranscriptLine
+
+
+def transcript():
+	lines = []
+	for i in range(40):
+		text = "I love this game so much" if i % 4 == 0 else "this boss is terrible honestly"
+		if 24 <= i < 28:
+			text = "LOL NO WAY!!! haha we actually did it chat this is insane!!!"
+		lines.append(TranscriptLine(start=i * 5.0, duration=4.0, text=text))
+	return lines
+
+
+@pytest.fixture
+def no_scoring(monkeypatch):
+	def fail(transcript, sentiments):
+		raise AssertionError("sentiment was scored")
+
+	monkeypatch.setattr(phrase_detector, "ensure_sentiments", fail)
+	monkeypatch.setattr(highlight_detector, "ensure_sentiments", fail)
+
+
+def test_zero_weight_skips_sentiment_scoring(no_scoring):
+	assert phrase_detector.detect_hot_phrases(transcript(), sentiment_weight=0)
+	assert highlight_detector.detect_highlights(transcript(), sentiment_weight=0)
+
+
+def test_sentiment_changes_phrase_scores():
+	lines = transcript()
+	positive = [1.0] * len(lines)
+	plain = {h.phrase: h.score for h in phrase_detector.detect_hot_phrases(lines, sentiment_weight=0)}
+	boosted = {h.phrase: h.score for h in phrase_detector.detect_hot_phrases(lines, sentiments=positive)}
+	assert plain.keys() == boosted.keys()
+	assert all(boosted[p] > plain[p] for p in plain)
+
+
+def test_zero_weight_highlights_do_not_mention_sentiment():
+	for h in highlight_detector.detect_highlights(transcript(), sentiment_weight=0):
+		assert "sentiment" not in h.reason
@@ -0,0 +1,95 @@
+import math
+import time
+import wave
+from array import array
+
+from flashfoundry import stt
+
+
+def pcm(*parts):
+	"""Concatenate (seconds, amplitude) parts of a 300 Hz tone into 16 kHz int16 PCM."""
+	samples = array("h")
+	for seconds, amplitude in parts:
+		n = int(seconds * stt.SAMPLE_RATE)
+		samples.extend(int(amplitude * math.sin(2 * math.pi * 300 * i / stt.SAMPLE_RATE)) for i in range(n))
+	return samples.tobytes()
+
+
+def blocks(data, size):
+	for i in range(0, len(data), size):
+		yield data[i : i + size]
+
+
+def test_quietest_cut_lands_in_the_pause():
+	data = pcm((1.2, 8000), (0.2, 0), (0.6, 8000))
+	lo, hi = 1 * stt.BYTES_PER_SECOND, 2 * stt.BYTES_PER_SECOND
+	cut = stt._quietest_cut(bytearray(data), lo, hi)
+	assert 1.2 * stt.BYTES_PER_SECOND <= cut <= 1.4 * stt.BYTES_PER_SECOND
+	assert cut % 2 == 0
+
+
+def test_quietest_cut_without_a_full_frame_returns_hi():
+	assert stt._quietest_cut(bytearray(100), 0, 50) == 50
+
+
+def test_split_chunks_cuts_at_pauses_and_keeps_every_byte():
+	# Speech with a short pause every 2.5 s; 3 s chunks searched over their last second
+	data = pcm(*[(2.4, 8000), (0.1, 0)] * 4, (1.0, 8000))
+	for size in (3000, stt.BYTES_PER_SECOND, len(data)):
+		chunks = list(stt._split_chunks(blocks(data, size), chunk_seconds=3.0, search_seconds=1.0))
+		assert b"".join(c for _, c in chunks) == data
+		offset = 0
+		for start, chunk in chunks:
+			assert start == offset / stt.BYTES_PER_SECOND
+			offset += len(chunk)
+		for start, chunk in chunks[:-1]:
+			end = start + len(chunk) / stt.BYTES_PER_SECOND
+			assert abs(end % 2.5 - 2.45) <= 0.05
+
+
+def fake_init(model_path):
+	pass
+
+
+def fake_decode(offset, data):
+	"""One word per half second; the first chunk is the slowest to finish."""
+	if offset == 0:
+		time.sleep(0.3)
+	seconds = len(data) / stt.BYTES_PER_SECOND
+	words = [(offset + t / 2, offset + t / 2 + 0.4, f"w{offset + t / 2:.1f}") for t in range(int(seconds * 2))]
+	return [words[i : i + 5] for i in range(0, len(words), 5)], 0.01
+
+
+def test_transcribe_file_yields_chunks_in_order(tmp_path, monkeypatch):
+	monkeypatch.setattr(stt, "_init_worker", fake_init)
+	monkeypatch.setattr(stt, "_decode_chunk", fake_decode)
+	path = str(tmp_path / "talk.wav")
+	data = pcm(*[(1.9, 8000), (0.1, 0)] * 5)
+	with wave.open(path, "wb") as wav:
+		wav.setnchannels(1)
+		wav.setsampwidth(2)
+		wav.setframerate(stt.SAMPLE_RATE)
+		wav.writeframes(data)
+	chunks = list(stt._split_chunks(blocks(data, stt.BYTES_PER_SECOND), chunk_seconds=2.0))
+	expected = [w for offset, chunk in chunks for utt in fake_decode(offset, chunk)[0] for _, _, w in utt]
+
+	stats = stt.TranscriptionStats()
+	lines = list(stt.transcribe_file(path, "unused-model", chunk_seconds=2.0, workers=3, max_words=3, stats=stats))
+
+	starts = [line.start for line in lines]
+	assert starts == sorted(starts)
+	words = " ".join(line.text for line in lines).split()
+	assert words == expected
+	assert all(len(line.text.split()) <= 3 for line in lines)
+	assert stats.chunks == len(chunks) > 3
+	assert stats.audio_seconds == 10.0
+	assert stats.decode_seconds > 0
+
+
+def test_default_workers_is_capped(monkeypatch):
+	monkeypatch.setattr(stt.os, "cpu_count", lambda: 16)
+	assert stt.default_workers() == stt.DEFAULT_MAX_WORKERS == 4
+	monkeypatch.setattr(stt.os, "cpu_count", lambda: 2)
+	assert stt.default_workers() == 2
+	monkeypatch.setattr(stt.os, "cpu_count", lambda: None)
+	assert stt.default_workers() == 1
@@ -0,0 +1,60 @@
+import os
+import json
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+GLOSSARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "fa_en_glossary.json")
+
+
+class GlossaryMatcher:
+    """Ordered Persian -> English glossary compiled into a single regex.
+
+    Every entry is wrapped in its own capturing group inside one lookahead
+    alternation, so a single ``finditer`` pass visits each position once and
+    reports the highest-priority entry matching there. The lowest entry index
+    seen across the scan is the same term the old one-regex-at-a-time loop
+    would have returned.
+    """
+
+    def __init__(self, entries: List[Tuple[str, str]]):
+        alternatives: List[str] = []
+        self._group_to_index: Dict[int, int] = {}
+        self._english: List[str] = []
+        group = 0
+        for idx, (pattern, english) in enumerate(entries):
+            inner_groups = re.compile(pattern).groups
+            group += 1
+            self._group_to_index[group] = idx
+            self._english.append(english)
+            alternatives.append(f"({pattern})")
+            group += inner_groups
+        self._regex = re.compile("(?=" + "|".join(alternatives) + ")") if alternatives else None
+
+    def __len__(self) -> int:
+        return len(self._english)
+
+    def match(self, text: str) -> Optional[str]:
+        if self._regex is None or not text:
+            return None
+        best = len(self._english)
+        for m in self._regex.finditer(text):
+            idx = self._group_to_index[m.lastindex]  # type: ignore[index]
+            if idx < best:
+                best = idx
+                if best == 0:
+                    break
+        return self._english[best] if best < len(self._english) else None
+
+
+def load_glossary(path: str = GLOSSARY_PATH) -> GlossaryMatcher:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = [(str(it["pattern"]), str(it["english"])) for it in data.get("terms", [])]
+    return GlossaryMatcher(entries)
+
+
+@lru_cache(maxsize=1)
+def default_glossary() -> GlossaryMatcher:
+    return load_glossary()
@@ -0,0 +1,108 @@
+"""Measure ocr_service throughput and latency at increasing concurrency.
+
+Usage::
+
+    python ocr_loadtest.py [--url http://127.0.0.1:8765] [--images input] [--concurrency 1,2,4,8] [--requests 20]
+
+For each concurrency level, that many client threads post images from
+``--images`` (cycling through them) until ``--requests`` responses have
+come back. Prints images/s and latency p50/p95 per level, plus the mean
+batch size the service formed.
+"""
+import argparse
+import json
+import math
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+
+def post_image(url: str, data: bytes) -> float:
+    started = time.perf_counter()
+    request = urllib.request.Request(url + "/translate", data=data, headers={"Content-Type": "application/octet-stream"})
+    with urllib.request.urlopen(request, timeout=600) as response:
+        response.read()
+    return (time.perf_counter() - started) * 1000.0
+
+
+def get_stats(url: str) -> Dict[str, Any]:
+    with urllib.request.urlopen(url + "/stats", timeout=30) as response:
+        return json.load(response)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(1, int(math.ceil(q / 100.0 * len(ordered)))) - 1] if ordered else float("nan")
+
+
+def run_level(url: str, images: List[bytes], concurrency: int, requests: int) -> Dict[str, Any]:
+    before = get_stats(url)
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client() -> None:
+        nonlocal errors
+        for i in counter:
+            try:
+                ms = post_image(url, images[i % len(images)])
+            except Exception:
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                latencies.append(ms)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    wall = time.perf_counter() - started
+    after = get_stats(url)
+    batches = after["batches"] - before["batches"]
+    served = after["requests"] - before["requests"]
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "images_per_s": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "mean_batch_size": round(served / batches, 2) if batches else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test ocr_service.py.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--images", default="input", help="Directory of images to post")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated client counts")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per concurrency level")
+    parser.add_argument("--json", dest="json_path", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    names = sorted(n for n in os.listdir(args.images) if n.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")))
+    if not names:
+        parser.error(f"no images in {args.images}")
+    images = []
+    for name in names:
+        with open(os.path.join(args.images, name), "rb") as f:
+            images.append(f.read())
+
+    results = []
+    print(f"{'clients':>7} {'img/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'batch':>6} {'errors':>6}")
+    for level in (int(c) for c in args.concurrency.split(",")):
+        row = run_level(args.url, images, level, args.requests)
+        results.append(row)
+        print(f"{row['concurrency']:>7} {row['images_per_s']:>7.2f} {row['p50_ms']:>8.0f} {row['p95_ms']:>8.0f} {row['mean_batch_size']:>6.2f} {row['errors']:>6}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
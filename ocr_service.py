@@ -0,0 +1,249 @@
+"""Long-running HTTP service around process_images with a warm EasyOCR reader.
+
+Usage::
+
+    python ocr_service.py [--port 8765] [--batch-size 4] [--max-wait-ms 30]
+
+Endpoints:
+
+- ``POST /translate``: body is an encoded image (JPEG/PNG/...). Returns JSON
+  with ``image_png`` (base64 PNG of the translated page), ``segments`` (the
+  same list ``process_image`` writes) and ``timings_ms`` for this request.
+- ``GET /stats``: queue depth, batch counts and per-stage p50/p95 timings.
+- ``GET /health``
+
+The reader is loaded once at startup. Requests are queued, and a single
+OCR worker thread takes up to ``batch_size`` images at a time, waiting at
+most ``max_wait_ms`` for a batch to fill. Images of the same size in a batch
+go through EasyOCR's ``readtext_batched`` together. The worker does nothing
+but OCR: translation (a network call per segment), inpainting, rendering
+and PNG encoding run on the request's own thread, so a slow translation
+never holds up the next batch.
+"""
+import argparse
+import base64
+import io
+import json
+import math
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from process_images import get_reader, translate_page
+
+STAGES = ["queue", "ocr", "translate_render", "encode", "total"]
+MAX_IMAGE_BYTES = 32 * 1024 * 1024
+
+
+class Job:
+    def __init__(self, bgr: np.ndarray):
+        self.bgr = bgr
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.ocr_results: Any = None
+        self.image = None
+        self.segments: List[Dict[str, Any]] = []
+        self.error: Optional[BaseException] = None
+        self.timings: Dict[str, float] = {}
+
+
+class OCRService:
+    def __init__(self, batch_size: int = 4, max_wait_ms: float = 30.0, window: int = 500, reader: Any = None):
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.reader = reader if reader is not None else get_reader()
+        self._queue: "queue.Queue[Job]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._timings: Dict[str, Deque[float]] = {name: deque(maxlen=window) for name in STAGES}
+        self._batch_sizes: Deque[int] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.started = time.time()
+        threading.Thread(target=self._worker, name="ocr", daemon=True).start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, bgr: np.ndarray) -> Job:
+        job = Job(bgr)
+        self._queue.put(job)
+        return job
+
+    def _collect(self) -> List[Job]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for job in batch:
+                job.timings["queue"] = (started - job.enqueued) * 1000.0
+            try:
+                results = self._ocr(batch)
+            except Exception as e:
+                results = None
+                for job in batch:
+                    job.error = e
+            ocr_ms = (time.perf_counter() - started) * 1000.0 / len(batch)
+            with self._lock:
+                self.batches += 1
+                self._batch_sizes.append(len(batch))
+            for job, result in zip(batch, results or [None] * len(batch)):
+                job.timings["ocr"] = ocr_ms
+                job.ocr_results = result
+                job.done.set()
+
+    def translate(self, job: Job) -> None:
+        """Translate and render an OCR'd job; runs on the caller's thread."""
+        t0 = time.perf_counter()
+        try:
+            job.image, job.segments = translate_page(job.bgr, self.reader, job.ocr_results)
+        except Exception as e:
+            job.error = e
+        job.timings["translate_render"] = (time.perf_counter() - t0) * 1000.0
+
+    def _ocr(self, batch: List[Job]) -> List[Any]:
+        """EasyOCR results per job; same-sized images share one batched call."""
+        results: List[Any] = [None] * len(batch)
+        by_shape: Dict[Any, List[int]] = {}
+        for i, job in enumerate(batch):
+            by_shape.setdefault(job.bgr.shape, []).append(i)
+        for indices in by_shape.values():
+            if len(indices) == 1:
+                results[indices[0]] = self.reader.readtext(batch[indices[0]].bgr)
+                continue
+            batched = self.reader.readtext_batched([batch[i].bgr for i in indices], batch_size=len(indices))
+            for i, result in zip(indices, batched):
+                results[i] = result
+        return results
+
+    def record(self, job: Job) -> None:
+        with self._lock:
+            self.requests += 1
+            if job.error is not None:
+                self.errors += 1
+                return
+            for name, value in job.timings.items():
+                self._timings[name].append(value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = list(self._batch_sizes)
+            stages = {name: {"p50": _percentile(list(v), 50), "p95": _percentile(list(v), 95)} for name, v in self._timings.items()}
+            return {
+                "queue_depth": self.queue_depth,
+                "requests": self.requests,
+                "errors": self.errors,
+                "batches": self.batches,
+                "mean_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else 0.0,
+                "batch_size_limit": self.batch_size,
+                "uptime_s": round(time.time() - self.started, 1),
+                "stages_ms": stages,
+            }
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[max(1, int(math.ceil(q / 100.0 * len(ordered)))) - 1], 1)
+
+
+def make_handler(service: OCRService):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/stats":
+                self._send_json(200, service.stats())
+            elif self.path == "/health":
+                self._send_json(200, {"ok": True, "queue_depth": service.queue_depth})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            if self.path != "/translate":
+                self._send_json(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            if not 0 < length <= MAX_IMAGE_BYTES:
+                self._send_json(413 if length else 400, {"error": "expected an image body"})
+                return
+            started = time.perf_counter()
+            data = np.frombuffer(self.rfile.read(length), dtype=np.uint8)
+            bgr = cv2.imdecode(data, cv2.IMREAD_COLOR)
+            if bgr is None:
+                self._send_json(400, {"error": "could not decode image"})
+                return
+            job = service.submit(bgr)
+            job.done.wait()
+            if job.error is None:
+                service.translate(job)
+            if job.error is not None:
+                service.record(job)
+                self._send_json(500, {"error": str(job.error)})
+                return
+            t0 = time.perf_counter()
+            buf = io.BytesIO()
+            job.image.save(buf, format="PNG")
+            job.timings["encode"] = (time.perf_counter() - t0) * 1000.0
+            job.timings["total"] = (time.perf_counter() - started) * 1000.0
+            service.record(job)
+            self._send_json(200, {
+                "image_png": base64.b64encode(buf.getvalue()).decode("ascii"),
+                "segments": job.segments,
+                "timings_ms": {k: round(v, 1) for k, v in job.timings.items()},
+            })
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve process_images over HTTP with a warm OCR model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-size", type=int, default=4, help="Most images OCR'd together")
+    parser.add_argument("--max-wait-ms", type=float, default=30.0, help="Longest wait for a batch to fill")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    service = OCRService(batch_size=args.batch_size, max_wait_ms=args.max_wait_ms)
+    print(f"OCR reader loaded in {time.perf_counter() - t0:.1f}s")
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    server.daemon_threads = True
+    print(f"Listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,18 @@
+import argparse
 import os
 import json
 import re
-from typing import List, Tuple, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Tuple, Dict, Any, Iterator, Optional
 
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
-try:
+from glossary import default_glossary
+
+if TYPE_CHECKING:
     import easyocr  # type: ignore
-except Exception as e:
-    raise RuntimeError(f"EasyOCR is required but failed to import: {e}")
 
 
 FA_CHAR_PATTERN = re.compile(r"[\u0600-\u06FF]")
@@ -49,52 +51,10 @@ IRANIAN_MONTHS_MAP = {
 
 
 def apply_custom_terms(english_text: str, original_fa: str) -> str:
-    # Enforce required naming for school
-    fa = original_fa or ""
-    school_regexes = [
-        r"علام[هۀ]\s+حل[یىي]\s*(?:6|٦|شش)?",  # علامه حلی 6 variants
-        r"علام[هۀ]\s+عل[یىي]\s*(?:6|٦|شش)",   # OCR: حلی -> علی
-        r"دبیرستان\s+علام[هۀ]\s+حل[یىي]\s*(?:6|٦|شش)?",
-        r"حلى\s*(?:6|٦|شش)?",                  # Arabic yeh variant
-    ]
-    for pat in school_regexes:
-        if re.search(pat, fa):
-            return "Allame Heli 6"
-
-    # Common domain terms normalization when the original clearly matches
-    term_map = [
-        (r"جمهور[یى]\s+اسلام[یى]\s+ا?یران", "Islamic Republic of Iran"),
-        (r"وزارت\s+آموزش(?:\s+و)?\s+پرورش", "Ministry of Education"),
-        (r"استان\s+تهران", "Tehran Province"),
-        (r"نام\s+و\s*نام\s+خانواد(?:گ(?:ی|ى)|كى)", "Full name"),
-        (r"نام\s+درس", "Course name"),
-        (r"کلاس|كلاس", "Class"),
-        (r"پایه(?:\s+تحصیلی)?", "Grade"),
-        (r"سال\s+تحصیلی", "Academic Year"),
-        (r"نمره\s+نهایی", "Final score"),
-        (r"نهایی", "Final"),
-        (r"رتبه\s+در", "Rank in"),
-        (r"منطقه", "District"),
-        (r"مجموع\s*:?", "Total:"),
-        (r"معدل\s+کل", "Overall GPA"),
-        (r"تفكر\s+وسبك\s+زندگ[یى]", "Thinking and Lifestyle"),
-        (r"برنامه\s+نويس[یى]", "Programming"),
-        (r"هندسه", "Geometry"),
-        (r"پیام(?:\s+های)?\s+آسمان(?:[یى])?", "Heavenly Messages"),
-        (r"فیز(?:یک|يك|بک)", "Physics"),
-        (r"زيست\s+شناسی|زیست\s+شناسی", "Biology"),
-        (r"زبان\s+انگلیسی|زبان\s+انکلیسی|زبان\s+انكليسى", "English Language"),
-        (r"املا", "Spelling"),
-        (r"ادبیات|ادبمات", "Literature"),
-        (r"ریاض[یى]|ریافی|رىاضی", "Mathematics"),
-        (r"فرهنگ\s+و\s+هنر|فرهنك\s+وهنر", "Arts & Culture"),
-        (r"مطالعات\s+اجتماع[یى]", "Social Studies"),
-        (r"زمین\s+شناسی|زمين\s+شناسی", "Geology"),
-        (r"پژوهش|پروهش", "Research"),
-    ]
-    for pat, replacement in term_map:
-        if re.search(pat, fa):
-            return replacement
+    # School naming and common domain terms, in glossary priority order
+    term = default_glossary().match(original_fa or "")
+    if term is not None:
+        return term
 
     # Minor normalization of school name in any English guess
     english_text = (english_text or "").replace("Allame Helli 6", "Allame Heli 6").replace("Allame Helli", "Allame Heli")
@@ -287,13 +247,27 @@ def inpaint_regions(bgr_img: np.ndarray, polys: List[List[List[float]]]) -> np.n
     return inpainted
 
 
-def process_image(input_path: str, output_image_path: str, output_json_path: str) -> None:
-    bgr = cv2.imread(input_path, cv2.IMREAD_COLOR)
-    if bgr is None:
-        raise RuntimeError(f"Failed to read image: {input_path}")
+@lru_cache(maxsize=1)
+def get_reader() -> "easyocr.Reader":
+    try:
+        import easyocr  # type: ignore
+    except Exception as e:
+        raise RuntimeError(f"EasyOCR is required but failed to import: {e}")
+    # Loading the detection/recognition models dominates per-image cost; share one reader
+    return easyocr.Reader(['fa', 'ar', 'en'], gpu=False)
 
-    reader = easyocr.Reader(['fa', 'ar', 'en'], gpu=False)
-    results = reader.readtext(bgr)
+
+def translate_page(
+    bgr: np.ndarray,
+    reader: Optional["easyocr.Reader"] = None,
+    results: Optional[List[Any]] = None,
+) -> Tuple[Image.Image, List[Dict[str, Any]]]:
+    """Run OCR -> translate -> render on one BGR page and return the rendered image and its segments.
+
+    Pass ``results`` (EasyOCR ``readtext`` output for ``bgr``) when OCR has already run, e.g. batched.
+    """
+    if results is None:
+        results = (reader or get_reader()).readtext(bgr)
 
     segments: List[Dict[str, Any]] = []
     polys_to_remove: List[List[List[float]]] = []
@@ -338,6 +312,16 @@ def process_image(input_path: str, output_image_path: str, output_json_path: str
 
         draw_text_within_bbox(pil_img, seg["english"], (x1, y1, x2, y2), text_color_bgr)
 
+    return pil_img, segments
+
+
+def process_image(input_path: str, output_image_path: str, output_json_path: str) -> None:
+    bgr = cv2.imread(input_path, cv2.IMREAD_COLOR)
+    if bgr is None:
+        raise RuntimeError(f"Failed to read image: {input_path}")
+
+    pil_img, segments = translate_page(bgr)
+
     # Save PNG preserving original resolution
     pil_img.save(output_image_path, format="PNG")
 
@@ -346,15 +330,93 @@ def process_image(input_path: str, output_image_path: str, output_json_path: str
         json.dump(segments, f, ensure_ascii=False, indent=2)
 
 
+def is_multipage_document(path: str) -> bool:
+    lower = path.lower()
+    if lower.endswith(".pdf"):
+        return True
+    if lower.endswith((".tif", ".tiff")):
+        with Image.open(path) as img:
+            return getattr(img, "n_frames", 1) > 1
+    return False
+
+
+def iter_tiff_pages(path: str) -> Iterator[Tuple[np.ndarray, float]]:
+    # Pillow decodes only the frame selected by seek(), so one page is resident at a time
+    with Image.open(path) as img:
+        dpi = float(img.info.get("dpi", (72, 72))[0] or 72)
+        for idx in range(getattr(img, "n_frames", 1)):
+            img.seek(idx)
+            rgb = np.asarray(img.convert("RGB"))
+            yield cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR), dpi
+
+
+# Resolution PDF pages are rasterised at before OCR; TIFF pages keep their own
+PDF_RENDER_DPI = 200
+
+
+def iter_pdf_pages(path: str, dpi: int = PDF_RENDER_DPI) -> Iterator[Tuple[np.ndarray, float]]:
+    try:
+        try:
+            import pymupdf as fitz  # type: ignore
+        except ImportError:
+            import fitz  # type: ignore  # PyMuPDF < 1.24.3
+    except Exception as e:
+        raise RuntimeError(f"PyMuPDF is required for PDF input but failed to import: {e}")
+    with fitz.open(path) as doc:
+        for page in doc:
+            pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csRGB, alpha=False)
+            rgb = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+            bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+            del pix, rgb
+            yield bgr, float(dpi)
+
+
+def iter_document_pages(path: str, dpi: int = PDF_RENDER_DPI) -> Iterator[Tuple[np.ndarray, float]]:
+    """Yield (bgr_page, dpi) one page at a time from a PDF or multi-page TIFF."""
+    if path.lower().endswith(".pdf"):
+        return iter_pdf_pages(path, dpi=dpi)
+    return iter_tiff_pages(path)
+
+
+def process_document(input_path: str, output_pdf_path: str, output_json_path: str, dpi: int = PDF_RENDER_DPI) -> int:
+    """Translate a multi-page document page by page.
+
+    Each rendered page is appended to the output PDF and its segments are
+    appended to the JSON transcript as soon as it is done, so only the page
+    being decoded and the page being rendered are held in memory.
+    """
+    reader = get_reader()
+    pages = 0
+    with open(output_json_path, "w", encoding="utf-8") as jf:
+        jf.write("[\n")
+        for page_no, (bgr, page_dpi) in enumerate(iter_document_pages(input_path, dpi=dpi), start=1):
+            pil_img, segments = translate_page(bgr, reader)
+            del bgr
+            pil_img.save(output_pdf_path, format="PDF", resolution=page_dpi, append=page_no > 1)
+            del pil_img
+            if page_no > 1:
+                jf.write(",\n")
+            json.dump({"page": page_no, "segments": segments}, jf, ensure_ascii=False, indent=2)
+            jf.flush()
+            pages = page_no
+        jf.write("\n]\n")
+    return pages
+
+
 def main() -> None:
-    input_dir = "/workspace/input"
-    output_dir = "/workspace/output"
+    parser = argparse.ArgumentParser(description="Translate Persian text in images and scanned documents to English.")
+    parser.add_argument("--input-dir", default="/workspace/input")
+    parser.add_argument("--output-dir", default="/workspace/output")
+    parser.add_argument("--dpi", type=int, default=PDF_RENDER_DPI, help="Resolution PDF pages are rendered at")
+    args = parser.parse_args()
+    input_dir = args.input_dir
+    output_dir = args.output_dir
     os.makedirs(output_dir, exist_ok=True)
 
-    # Gather up to 5 images
+    # Gather up to 5 images or documents
     candidates = []
     for name in sorted(os.listdir(input_dir)):
-        if name.lower().endswith((".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")):
+        if name.lower().endswith((".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".pdf")):
             candidates.append(name)
     # If there are specific 1..5.jpg files, keep their order
     priority = ["1.jpg", "2.jpg", "3.jpg", "4.jpg", "5.jpg"]
@@ -365,9 +427,13 @@ def main() -> None:
     for fname in images:
         in_path = os.path.join(input_dir, fname)
         base, _ = os.path.splitext(fname)
-        out_img = os.path.join(output_dir, f"{base}.png")
         out_json = os.path.join(output_dir, f"{base}.json")
-        process_image(in_path, out_img, out_json)
+        if is_multipage_document(in_path):
+            out_pdf = os.path.join(output_dir, f"{base}.pdf")
+            process_document(in_path, out_pdf, out_json, dpi=args.dpi)
+        else:
+            out_img = os.path.join(output_dir, f"{base}.png")
+            process_image(in_path, out_img, out_json)
 
 
 if __name__ == "__main__":
@@ -1,112 +1,115 @@
-from vosk import Model , KaldiRecognizer
+import asyncio
+
 import pyaudio
-import time 
-from playsound import playsound
-import json
-import edge_tts
-from openai import OpenAI
-VOICE = "en-US-JessaNeural"
-OUTPUT_FILE = "C:/Users/Mobile Gandom/Desktop/project_files/test_en.mp3"
-messages = []
-client = OpenAI(
-    base_url="https://api-inference.huggingface.co/v1/",
-    api_key="your_api_key"
-)
-model = Model("Path-to-your-english-vosk-model")
-recognizer = KaldiRecognizer(model, 16000)
-with open("ttt.txt", 'w') as file:  
-    pass 
-# Start audio stream
-mic = pyaudio.PyAudio()
-stream = mic.open(            format=pyaudio.paInt16,
-            channels=1,
-            rate=16000,
-            input=True,
-            frames_per_buffer=8000)
-stream.start_stream()
+from vosk import Model, KaldiRecognizer
 
+from assistant.audio import MicrophoneCapture, SAMPLE_RATE
+from assistant.backends import EdgeTTS, HTTPChat, ResilientChat
+from assistant.cache import ResponseCache
+from assistant.keywords import keyword_grammar
+from assistant.memory import ConversationMemory
+from assistant.metrics import MetricsRecorder, serve_prometheus
+from assistant.pipeline import VoiceAssistant
+from assistant.playback import AudioPlayer, PyAudioOutput, load_audio_file
+from assistant.session_log import SessionLogger
+from assistant.vad import Endpointer
+
+VOICE = "en-US-JessaNeural"
+LLM_BASE_URL = "https://api-inference.huggingface.co/v1/"
+LLM_API_KEY = "your_api_key"
+# Optional second OpenAI-compatible endpoint (e.g. a local server) for fail-over and hedging
+LLM_SECONDARY_URL = None
+LLM_SECONDARY_API_KEY = ""
+LLM_TIMEOUT_SECONDS = 30
+LLM_RETRIES = 2
+# Also send the request to the secondary if no token has arrived after this long
+LLM_HEDGE_AFTER_SECONDS = 1.5
+DING_FILE = "C:/Users/Mobile Gandom/Desktop/project_files/ding.mp3"
+# One JSON line per turn (question, answer, latencies); rotated at SESSION_LOG_MAX_BYTES
+SESSION_LOG_FILE = "session_log.jsonl"
+SESSION_LOG_MAX_BYTES = 5 * 1024 * 1024
+VOSK_MODEL_PATH = "Path-to-your-english-vosk-model"
+# Silence (ms) after speech before a question counts as finished
+VAD_HANGOVER_MS = 600
+# A question is cut off (and answered) after this long even if the VAD still hears speech
+VAD_MAX_UTTERANCE_MS = 15000
+START_KEYWORD = "start"
+END_KEYWORD = "end"
+# The wake word always interrupts an answer. Set True to also interrupt by just speaking
+# over it; only with a headset or echo cancellation, as speaker audio would cut itself off
+BARGE_IN_ON_SPEECH = False
+# Upper bound on prompt size (history + summary + question) per request
+CONTEXT_TOKEN_BUDGET = 1200
+# Answers (text + audio) to repeated questions are replayed from here; follow-ups that
+# refer back to the conversation ("what does it mean") are always sent to the model
+RESPONSE_CACHE_DIR = "response_cache"
+RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# Per-turn latency spans are written with each turn in the session log;
+# set METRICS_PORT (e.g. 9464) to also serve /metrics for Prometheus
+METRICS_PORT = None
 
-last_two_partials = ["", ""]
-is_recognizing = False
-a = 0
-while True:
-    print("Listening...")
-    data = stream.read(4000, exception_on_overflow=False)  
-    
-    ########################
-    if recognizer.AcceptWaveform(data):
-        result = recognizer.Result()
-    else :
-        result = recognizer.PartialResult()
-    try:
-        result_dict = json.loads(result)  
-    except json.JSONDecodeError:
-        continue
-    if "start" in result_dict.get("text", ""):
-        if not is_recognizing: 
-            is_recognizing = True
-            print("recognition started!")
-            playsound("C:/Users/Mobile Gandom/Desktop/project_files/ding.mp3")
-    elif "end" in result_dict.get("text", ""):
-        if is_recognizing:  
-            is_recognizing = False
-            print("recognition stopted")
-            playsound("C:/Users/Mobile Gandom/Desktop/project_files/ding.mp3")
-    ###################
-    if "partial" in result_dict:
 
-        partial_text = result_dict["partial"].strip()
+def main() -> None:
+    model = Model(VOSK_MODEL_PATH)
+    recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+    # Same loaded model, tiny grammar: cheap enough to run on every idle utterance
+    spotter = KaldiRecognizer(model, SAMPLE_RATE, keyword_grammar([START_KEYWORD, END_KEYWORD]))
+    # Start audio stream
+    mic = pyaudio.PyAudio()
+    stream = mic.open(format=pyaudio.paInt16,
+                      channels=1,
+                      rate=SAMPLE_RATE,
+                      input=True,
+                      frames_per_buffer=8000)
+    stream.start_stream()
+    player = AudioPlayer(PyAudioOutput(mic))
+    # Decode the earcon once; every start/end keyword reuses the PCM buffer
+    earcon = load_audio_file(DING_FILE, player.sample_rate, player.channels)
 
-        if partial_text and is_recognizing:
-            last_two_partials[0], last_two_partials[1] = last_two_partials[
-                            1], partial_text 
-            print(f"speaking : {partial_text}")
-        else:  # اگر partial خالی بود، آخرین partial غیرخالی را در فایل ذخیره می‌کنیم
-            if last_two_partials[1]:  # اگر آخرین partial معتبر است
-                with open("ttt.txt", mode="a", encoding="utf-8") as f:
-                    f.write(("User's question : "+(last_two_partials[1]).replace("end"," ")) + "\n")
-                    text = (last_two_partials[1]).replace("end","")
+    endpoints = [HTTPChat(LLM_BASE_URL, LLM_API_KEY, timeout=LLM_TIMEOUT_SECONDS)]
+    if LLM_SECONDARY_URL:
+        endpoints.append(HTTPChat(LLM_SECONDARY_URL, LLM_SECONDARY_API_KEY, timeout=LLM_TIMEOUT_SECONDS))
+    llm = ResilientChat(*endpoints, retries=LLM_RETRIES, hedge_after=LLM_HEDGE_AFTER_SECONDS)
+    metrics = MetricsRecorder()
+    session_log = SessionLogger(SESSION_LOG_FILE, max_bytes=SESSION_LOG_MAX_BYTES)
+    if METRICS_PORT:
+        serve_prometheus(metrics, METRICS_PORT)
+    assistant = VoiceAssistant(
+        recognizer=recognizer,
+        capture=MicrophoneCapture(stream),
+        llm=llm,
+        tts=EdgeTTS(VOICE),
+        player=player,
+        earcon=earcon,
+        start_keyword=START_KEYWORD,
+        end_keyword=END_KEYWORD,
+        endpointer=Endpointer(hangover_ms=VAD_HANGOVER_MS, max_utterance_ms=VAD_MAX_UTTERANCE_MS),
+        spotter=spotter,
+        memory=ConversationMemory(summarizer=llm, budget_tokens=CONTEXT_TOKEN_BUDGET),
+        cache=ResponseCache(RESPONSE_CACHE_DIR, ttl_seconds=RESPONSE_CACHE_TTL_SECONDS),
+        metrics=metrics,
+        session_log=session_log,
+        barge_in_on_speech=BARGE_IN_ON_SPEECH,
+    )
 
-                    translated_text = text
-                    username = "your username"
-                    assistant_name = "your ai username"
-                    a = a + 1
-                    if a == 1:
-                        prompt = f"""Generate a response that
-                        avoids using the characters '#' and '*'.
-                        The content should be clear and informative
-                        without including these symbols. 
-                        Question: {translated_text}"""
-                        messages.append({"role":"user","content":translated_text})
-                        response = client.chat.completions.create(
-                                        model="Qwen/Qwen2.5-72B-Instruct",
-                                        messages=[{"role": "user", "content": prompt}],
-                                        temperature=0.5,
-                                        max_tokens=1024,
-                                        top_p=0.7,
-                                    )
-                    else:
-                        messages.append({"role":"user","content":translated_text})
-                        response = client.chat.completions.create(
-                                        model="Qwen/Qwen2.5-72B-Instruct",
-                                        messages=[{"role": "user", "content": translated_text}],
-                                        temperature=0.5,
-                                        max_tokens=1024,
-                                        top_p=0.7,
-                                    )
-                    msg = response.choices[0].message.content
-                    messages.append({"role": "assistant", "content": msg})
-                    with open("tt.txt", mode="a", encoding="utf-8") as f:
-                        f.write(('English answer : '+msg) + "\n")
-                    communicate = edge_tts.Communicate(msg, VOICE)
-                    with open(OUTPUT_FILE, "wb") as file:
-                        for chunk in communicate.stream_sync():
-                            if chunk["type"] == "audio":
-                                file.write(chunk["data"])
-                    playsound(OUTPUT_FILE)
-                    is_recognizing = False
+    async def serve() -> None:
+        try:
+            await assistant.run()
+        finally:
+            for endpoint in endpoints:
+                await endpoint.aclose()
 
-                last_two_partials = ["", ""]
-                
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session_log.close()
+        player.close()
+        stream.stop_stream()
+        stream.close()
+        mic.terminate()
 
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The top-level scripts (process_images, glossary, ...) are imported as modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
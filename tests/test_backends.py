@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from assistant.backends import HTTPChat, LLMRequestError, ResilientChat
+from assistant.stubs import StubChatServer
+
+pytest.importorskip("httpx")
+
+ANSWER = "A noun names a thing. For example, a cat."
+MESSAGES = [{"role": "user", "content": "What is a noun?"}]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def complete(chat, *endpoints):
+    try:
+        return await chat.complete(MESSAGES)
+    finally:
+        for endpoint in endpoints:
+            await endpoint.aclose()
+
+
+def test_http_chat_streams_and_reuses_the_connection():
+    with StubChatServer(ANSWER, first_token_delay=0, token_delay=0) as server:
+        chat = HTTPChat(server.url)
+
+        async def main():
+            deltas = [d async for d in chat.stream(MESSAGES)]
+            text = await chat.complete(MESSAGES)
+            await chat.aclose()
+            return deltas, text
+
+        deltas, text = run(main())
+    assert len(deltas) > 1
+    assert "".join(deltas) == text == ANSWER
+    assert server.requests == 2
+    assert server.connections == 1
+
+
+def test_retries_transient_failures_before_the_first_token():
+    with StubChatServer(ANSWER, first_token_delay=0, token_delay=0, fail_first=2) as server:
+        endpoint = HTTPChat(server.url)
+        chat = ResilientChat(endpoint, retries=2, backoff=0.01)
+        assert run(complete(chat, endpoint)) == ANSWER
+    assert chat.retried == 2
+    assert server.requests == 3
+
+
+def test_gives_up_after_the_retry_budget():
+    with StubChatServer(ANSWER, fail_first=10) as server:
+        endpoint = HTTPChat(server.url)
+        chat = ResilientChat(endpoint, retries=1, backoff=0.01)
+        with pytest.raises(LLMRequestError) as err:
+            run(complete(chat, endpoint))
+    assert err.value.status == 503
+    assert chat.retried == 1
+    assert server.requests == 2
+
+
+def test_client_errors_are_not_retried():
+    with StubChatServer(ANSWER, fail_first=10, fail_status=401) as server:
+        endpoint = HTTPChat(server.url)
+        chat = ResilientChat(endpoint, retries=3, backoff=0.01)
+        with pytest.raises(LLMRequestError) as err:
+            run(complete(chat, endpoint))
+    assert err.value.status == 401
+    assert not err.value.retryable
+    assert chat.retried == 0
+    assert server.requests == 1
+
+
+def test_slow_primary_is_hedged_to_the_secondary():
+    with StubChatServer("slow answer", first_token_delay=2.0, token_delay=0) as slow, \
+            StubChatServer(ANSWER, first_token_delay=0, token_delay=0) as fast:
+        primary, secondary = HTTPChat(slow.url), HTTPChat(fast.url)
+        chat = ResilientChat(primary, secondary, hedge_after=0.1)
+        started = time.perf_counter()
+        text = run(complete(chat, primary, secondary))
+        elapsed = time.perf_counter() - started
+    assert text == ANSWER
+    assert (chat.hedged, chat.secondary_wins) == (1, 1)
+    assert elapsed < 1.0
+
+
+def test_fast_primary_is_not_hedged():
+    with StubChatServer(ANSWER, first_token_delay=0, token_delay=0) as server, \
+            StubChatServer("unused", first_token_delay=0) as spare:
+        primary, secondary = HTTPChat(server.url), HTTPChat(spare.url)
+        chat = ResilientChat(primary, secondary, hedge_after=1.0)
+        assert run(complete(chat, primary, secondary)) == ANSWER
+    assert chat.hedged == 0
+    assert spare.requests == 0
+
+
+def test_unreachable_primary_fails_over_at_once():
+    with StubChatServer(ANSWER, first_token_delay=0, token_delay=0) as server:
+        primary = HTTPChat("http://127.0.0.1:9/v1", connect_timeout=1.0)
+        secondary = HTTPChat(server.url)
+        chat = ResilientChat(primary, secondary, hedge_after=5.0, retries=0)
+        started = time.perf_counter()
+        text = run(complete(chat, primary, secondary))
+        elapsed = time.perf_counter() - started
+    assert text == ANSWER
+    assert (chat.hedged, chat.secondary_wins) == (1, 1)
+    assert elapsed < 2.0
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import wave
+
+import numpy as np
+import pytest
+
+from assistant.audio import SAMPLE_RATE
+from assistant.bench import run_benchmark
+from assistant.stubs import StubLLM, StubTTS
+
+
+class CountingRecognizer:
+    def __init__(self):
+        self.finals = 0
+
+    def AcceptWaveform(self, data):
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": "question"})
+
+    def FinalResult(self):
+        self.finals += 1
+        return json.dumps({"text": f"question number {self.finals}"})
+
+
+def write_questions(directory, count):
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        t = np.arange(int((1 + 0.3 * i) * SAMPLE_RATE)) / SAMPLE_RATE
+        pcm = np.concatenate([rng.normal(0, 30, SAMPLE_RATE // 2), 3000 * np.sin(2 * np.pi * 180 * t)]).astype(np.int16)
+        path = directory / f"q{i}.wav"
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            w.writeframes(pcm.tobytes())
+        paths.append(str(path))
+    return paths
+
+
+def test_every_file_is_one_answered_turn(tmp_path):
+    files = write_questions(tmp_path, 3)
+    recognizer = CountingRecognizer()
+    llm = StubLLM(first_token_delay=0.01, token_delay=0)
+    report = asyncio.run(run_benchmark(files, recognizer, llm=llm, tts=StubTTS(synth_delay=0), turn_timeout=10))
+
+    assert recognizer.finals == 3
+    assert [m[-1]["content"] for m in llm.requests][1:] == ["question number 2", "question number 3"]
+    assert report["files"] == 3
+    assert report["turns_completed"] == 3
+    assert report["turns_interrupted"] == 0
+    # 3 x 0.5 s of leading noise + 1.0/1.3/1.6 s of tone, plus 1.5 s of trailing silence per file
+    assert report["audio_seconds"] == pytest.approx(3 * 0.5 + 3.9 + 3 * 1.5)
+    assert 0 < report["vad_skipped_fraction"] < 1
+    assert report["time_to_first_audio_ms"]["count"] == 3
+    assert report["time_to_first_audio_ms"]["p50"] <= report["turn_ms"]["p50"]
+
+
+def test_metrics_file_gets_one_turn_record_per_question(tmp_path):
+    files = write_questions(tmp_path, 2)
+    path = tmp_path / "turns.jsonl"
+    llm = StubLLM(first_token_delay=0.01, token_delay=0)
+    asyncio.run(run_benchmark(files, CountingRecognizer(), llm=llm, tts=StubTTS(synth_delay=0), metrics_path=str(path)))
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["question"] for r in records] == ["question number 1", "question number 2"]
+    for r in records:
+        assert r["event"] == "turn" and not r["interrupted"]
+        assert r["latency_ms"]["turn"] >= r["latency_ms"]["time_to_first_audio"] > 0
+        assert list(r["marks_ms"])[0] == "speech_end"
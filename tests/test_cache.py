@@ -0,0 +1,67 @@
+from assistant.cache import ResponseCache, depends_on_context, normalize_question
+
+
+def store(cache, question, answer="A noun names a person, place or thing."):
+    cache.store(question, answer, [answer], [b"audio:" + answer.encode()])
+
+
+def test_exact_and_reordered_questions_hit():
+    cache = ResponseCache()
+    store(cache, "What is a noun?")
+    assert cache.lookup("um, what is a noun") is not None
+    assert cache.lookup("What is noun?") is not None
+    assert cache.lookup("A noun is what?") is not None
+    assert cache.hits == 3
+
+
+def test_negation_never_matches_positive_question():
+    cache = ResponseCache()
+    store(cache, "What is a noun?")
+    assert cache.lookup("What is not a noun?") is None
+    assert cache.lookup("What isn't a noun?") is None
+    store(cache, "Why is this not a sentence?", "It has no verb.")
+    assert cache.lookup("Why is this a sentence?") is None
+
+
+def test_content_words_must_match():
+    cache = ResponseCache()
+    store(cache, "Can you give me an example")
+    assert cache.lookup("Can you give me another example") is None
+    assert cache.lookup("What is a pronoun") is None
+    store(cache, "What is the past tense of go")
+    assert cache.lookup("What is the past tense of run") is None
+    assert cache.lookup("what is past tense of go") is not None
+
+
+def test_ttl_and_lru_eviction():
+    now = [1000.0]
+    cache = ResponseCache(max_entries=2, ttl_seconds=60, clock=lambda: now[0])
+    store(cache, "first question")
+    store(cache, "second question")
+    assert cache.lookup("first question") is not None
+    store(cache, "third question")
+    assert cache.lookup("second question") is None
+    assert len(cache) == 2
+    now[0] += 61
+    assert cache.lookup("first question") is None
+    assert len(cache) == 0
+
+
+def test_entries_persist_and_audio_loads_on_hit(tmp_path):
+    store(ResponseCache(str(tmp_path)), "What is a noun?")
+    reloaded = ResponseCache(str(tmp_path))
+    assert len(reloaded) == 1
+    entry = reloaded._entries[normalize_question("What is a noun?")]
+    assert entry.clips is None
+    hit = reloaded.lookup("what is a noun")
+    assert hit.clips == [b"audio:A noun names a person, place or thing."]
+
+
+def test_follow_ups_depend_on_context():
+    assert depends_on_context("What does it mean?")
+    assert depends_on_context("Can you give me another example")
+    assert depends_on_context("give me an example")
+    assert depends_on_context("why is that wrong")
+    assert depends_on_context("um")
+    assert not depends_on_context("What is a noun?")
+    assert not depends_on_context("How do I use the present perfect")
@@ -0,0 +1,122 @@
+import re
+
+import pytest
+
+from glossary import GlossaryMatcher, default_glossary
+
+
+# The per-regex loop apply_custom_terms used before the glossary moved to config
+SCHOOL_REGEXES = [
+    r"علام[هۀ]\s+حل[یىي]\s*(?:6|٦|شش)?",
+    r"علام[هۀ]\s+عل[یىي]\s*(?:6|٦|شش)",
+    r"دبیرستان\s+علام[هۀ]\s+حل[یىي]\s*(?:6|٦|شش)?",
+    r"حلى\s*(?:6|٦|شش)?",
+]
+TERM_MAP = [
+    (r"جمهور[یى]\s+اسلام[یى]\s+ا?یران", "Islamic Republic of Iran"),
+    (r"وزارت\s+آموزش(?:\s+و)?\s+پرورش", "Ministry of Education"),
+    (r"استان\s+تهران", "Tehran Province"),
+    (r"نام\s+و\s*نام\s+خانواد(?:گ(?:ی|ى)|كى)", "Full name"),
+    (r"نام\s+درس", "Course name"),
+    (r"کلاس|كلاس", "Class"),
+    (r"پایه(?:\s+تحصیلی)?", "Grade"),
+    (r"سال\s+تحصیلی", "Academic Year"),
+    (r"نمره\s+نهایی", "Final score"),
+    (r"نهایی", "Final"),
+    (r"رتبه\s+در", "Rank in"),
+    (r"منطقه", "District"),
+    (r"مجموع\s*:?", "Total:"),
+    (r"معدل\s+کل", "Overall GPA"),
+    (r"تفكر\s+وسبك\s+زندگ[یى]", "Thinking and Lifestyle"),
+    (r"برنامه\s+نويس[یى]", "Programming"),
+    (r"هندسه", "Geometry"),
+    (r"پیام(?:\s+های)?\s+آسمان(?:[یى])?", "Heavenly Messages"),
+    (r"فیز(?:یک|يك|بک)", "Physics"),
+    (r"زيست\s+شناسی|زیست\s+شناسی", "Biology"),
+    (r"زبان\s+انگلیسی|زبان\s+انکلیسی|زبان\s+انكليسى", "English Language"),
+    (r"املا", "Spelling"),
+    (r"ادبیات|ادبمات", "Literature"),
+    (r"ریاض[یى]|ریافی|رىاضی", "Mathematics"),
+    (r"فرهنگ\s+و\s+هنر|فرهنك\s+وهنر", "Arts & Culture"),
+    (r"مطالعات\s+اجتماع[یى]", "Social Studies"),
+    (r"زمین\s+شناسی|زمين\s+شناسی", "Geology"),
+    (r"پژوهش|پروهش", "Research"),
+]
+
+
+def old_match(fa):
+    for pat in SCHOOL_REGEXES:
+        if re.search(pat, fa):
+            return "Allame Heli 6"
+    for pat, replacement in TERM_MAP:
+        if re.search(pat, fa):
+            return replacement
+    return None
+
+
+CASES = [
+    # School name: heh / heh-with-yeh, the three yeh forms, and OCR's علی for حلی
+    ("علامه حلی 6", "Allame Heli 6"),
+    ("علامۀ حلی ۶", "Allame Heli 6"),
+    ("علامه حلى", "Allame Heli 6"),
+    ("علامه حلي شش", "Allame Heli 6"),
+    ("علامه علی 6", "Allame Heli 6"),
+    ("دبیرستان علامۀ حلي", "Allame Heli 6"),
+    ("حلى ٦", "Allame Heli 6"),
+    ("علامه علی", None),
+    # Arabic kaf / yeh spellings
+    ("جمهوری اسلامى ایران", "Islamic Republic of Iran"),
+    ("جمهورى اسلامی یران", "Islamic Republic of Iran"),
+    ("كلاس", "Class"),
+    ("نام و نام خانوادكى", "Full name"),
+    ("نام و نام خانوادگى", "Full name"),
+    ("تفكر وسبك زندگى", "Thinking and Lifestyle"),
+    ("برنامه نويسى", "Programming"),
+    ("فيزيك", None),
+    ("فیزيك", "Physics"),
+    ("زيست شناسی", "Biology"),
+    ("زمين شناسی", "Geology"),
+    ("فرهنك وهنر", "Arts & Culture"),
+    # OCR misspellings the glossary keeps
+    ("زبان انکلیسی", "English Language"),
+    ("زبان انكليسى", "English Language"),
+    ("ادبمات فارسی", "Literature"),
+    ("ریافی ۲", "Mathematics"),
+    ("رىاضی", "Mathematics"),
+    ("پروهش", "Research"),
+    # Priority: the earlier, longer entry wins wherever it appears in the text
+    ("نمره نهایی", "Final score"),
+    ("نهایی", "Final"),
+    ("نهایی و نمره نهایی", "Final score"),
+    ("منطقه ۳ استان تهران", "Tehran Province"),
+    ("پایه تحصیلی سال تحصیلی", "Grade"),
+    ("رتبه در منطقه", "Rank in"),
+    ("کلاس علامه حلی", "Allame Heli 6"),
+    ("مجموع:", "Total:"),
+    ("", None),
+    ("Allame Helli", None),
+]
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_matches_old_loop(text, expected):
+    assert old_match(text) == expected
+    assert default_glossary().match(text) == expected
+
+
+def test_config_keeps_old_order():
+    entries = [(p, "Allame Heli 6") for p in SCHOOL_REGEXES] + TERM_MAP
+    expected = GlossaryMatcher(entries)
+    glossary = default_glossary()
+    assert len(glossary) == len(entries)
+    for text, _ in CASES:
+        assert glossary.match(text) == expected.match(text)
+
+
+def test_inner_groups_do_not_shift_entries():
+    matcher = GlossaryMatcher([(r"(a)(b)c", "first"), (r"(x)y", "second"), (r"z", "third")])
+    assert matcher.match("..z..xy") == "second"
+    assert matcher.match("z abc") == "first"
+    assert matcher.match("z") == "third"
+    assert matcher.match("none") is None
+    assert GlossaryMatcher([]).match("abc") is None
@@ -0,0 +1,46 @@
+import json
+
+from assistant.keywords import (
+    UNKNOWN_WORD,
+    ends_with_keyword,
+    find_keyword,
+    has_keyword,
+    is_keyword,
+    keyword_grammar,
+    strip_trailing_keyword,
+    text_after_keyword,
+)
+
+
+def test_grammar_lists_keywords_once_plus_unknown():
+    assert json.loads(keyword_grammar(["End", "start", " start ", ""])) == ["end", "start", UNKNOWN_WORD]
+
+
+def test_keywords_match_whole_words_only():
+    assert find_keyword("please restart the weekend", "start") == -1
+    assert not has_keyword("the weekend is here", "end")
+    assert find_keyword("ok Start now", "start") == 1
+    assert find_keyword("hey there computer", "there computer") == 1
+    assert find_keyword("anything", "") == -1
+
+
+def test_text_after_keyword():
+    assert text_after_keyword("um start what is a verb", "start") == "what is a verb"
+    assert text_after_keyword("what is a verb", "start") == "what is a verb"
+    assert text_after_keyword("start", "start") == ""
+
+
+def test_only_a_trailing_end_keyword_is_stripped():
+    assert ends_with_keyword("what is a noun end", "end")
+    assert strip_trailing_keyword("what is a noun end", "end") == "what is a noun"
+    assert strip_trailing_keyword("how does the story end", "end") == "how does the story"
+    assert strip_trailing_keyword("at the end of the day", "end") == "at the end of the day"
+    assert strip_trailing_keyword("the weekend", "end") == "the weekend"
+    assert strip_trailing_keyword("end", "end") == ""
+    assert strip_trailing_keyword("that is all over now", "over now") == "that is all"
+
+
+def test_is_keyword_needs_the_whole_text():
+    assert is_keyword(" End ", "end")
+    assert not is_keyword("the end", "end")
+    assert not is_keyword("", "")
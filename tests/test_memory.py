@@ -0,0 +1,84 @@
+import asyncio
+
+from assistant.memory import ConversationMemory
+
+
+class SlowSummarizer:
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def complete(self, messages):
+        self.started.set()
+        await self.release.wait()
+        return "Learner is practising past tenses."
+
+
+def contents(messages):
+    return [m["content"] for m in messages[1:-1]]
+
+
+def test_turns_stay_visible_until_summary_is_ready():
+    async def main():
+        summarizer = SlowSummarizer()
+        memory = ConversationMemory(summarizer=summarizer, keep_recent_turns=2)
+        for i in range(3):
+            memory.add_turn(f"question {i}", f"answer {i}")
+        task = asyncio.ensure_future(memory.compact())
+        await summarizer.started.wait()
+        assert "question 0" in contents(memory.messages_for("next"))
+        assert memory.summary == ""
+
+        summarizer.release.set()
+        await task
+        assert list(memory.turns) == [("question 1", "answer 1"), ("question 2", "answer 2")]
+        assert "question 0" not in contents(memory.messages_for("next"))
+        assert "past tenses" in memory.messages_for("next")[0]["content"]
+
+    asyncio.run(main())
+
+
+def test_turns_added_during_summary_are_kept():
+    async def main():
+        summarizer = SlowSummarizer()
+        memory = ConversationMemory(summarizer=summarizer, keep_recent_turns=1)
+        memory.add_turn("q0", "a0")
+        memory.add_turn("q1", "a1")
+        task = asyncio.ensure_future(memory.compact())
+        await summarizer.started.wait()
+        memory.add_turn("q2", "a2")
+        summarizer.release.set()
+        await task
+        assert [q for q, _ in memory.turns] == ["q1", "q2"]
+
+    asyncio.run(main())
+
+
+def test_clear_during_summary_discards_it():
+    async def main():
+        summarizer = SlowSummarizer()
+        memory = ConversationMemory(summarizer=summarizer, keep_recent_turns=1)
+        memory.add_turn("q0", "a0")
+        memory.add_turn("q1", "a1")
+        task = asyncio.ensure_future(memory.compact())
+        await summarizer.started.wait()
+        memory.clear()
+        memory.add_turn("fresh", "start")
+        summarizer.release.set()
+        await task
+        assert memory.summary == ""
+        assert list(memory.turns) == [("fresh", "start")]
+
+    asyncio.run(main())
+
+
+def test_extractive_fallback_without_summarizer():
+    async def main():
+        memory = ConversationMemory(keep_recent_turns=1)
+        memory.add_turn("What is a noun?", "A noun names a thing. For example, a cat.")
+        memory.add_turn("And a verb?", "A verb is an action.")
+        await memory.compact()
+        assert memory.summary == "Learner asked: What is a noun? Tutor: A noun names a thing"
+        assert len(memory.turns) == 1
+
+    asyncio.run(main())
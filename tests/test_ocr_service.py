@@ -0,0 +1,130 @@
+import base64
+import http.client
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+
+import ocr_service  # noqa: E402
+import process_images  # noqa: E402
+
+
+class FakeReader:
+    """Finds one Persian word in the middle of every page."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def _page(self, bgr):
+        h, w = bgr.shape[:2]
+        return [([[w // 4, h // 3], [3 * w // 4, h // 3], [3 * w // 4, 2 * h // 3], [w // 4, 2 * h // 3]], "سلام", 0.9)]
+
+    def readtext(self, bgr):
+        self.calls.append(1)
+        if self.fail:
+            raise RuntimeError("reader failed")
+        time.sleep(self.delay)
+        return self._page(bgr)
+
+    def readtext_batched(self, images, batch_size=1):
+        self.calls.append(len(images))
+        time.sleep(self.delay)
+        return [self._page(img) for img in images]
+
+
+@pytest.fixture(autouse=True)
+def offline_translation(monkeypatch):
+    monkeypatch.setattr(process_images, "translate_fa_to_en", lambda text: "Hello")
+
+
+def page(width=160, height=80):
+    img = np.full((height, width, 3), 255, dtype=np.uint8)
+    cv2.putText(img, "text", (width // 4, 2 * height // 3), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+    return img
+
+
+def test_same_sized_pages_are_ocrd_in_one_batch():
+    reader = FakeReader(delay=0.05)
+    service = ocr_service.OCRService(batch_size=4, max_wait_ms=200, reader=reader)
+    jobs = [service.submit(page()) for _ in range(3)] + [service.submit(page(200, 100))]
+    for job in jobs:
+        assert job.done.wait(2)
+    assert sorted(reader.calls) == [1, 3]
+    assert all(job.ocr_results and job.image is None for job in jobs)
+    assert service.stats()["batches"] == 1
+
+
+def test_slow_translation_does_not_hold_up_the_next_batch(monkeypatch):
+    release = threading.Event()
+
+    def slow_translation(text):
+        release.wait(2)
+        return "Hello"
+
+    monkeypatch.setattr(process_images, "translate_fa_to_en", slow_translation)
+    service = ocr_service.OCRService(batch_size=1, max_wait_ms=0, reader=FakeReader())
+    first = service.submit(page())
+    assert first.done.wait(2)
+    translating = threading.Thread(target=service.translate, args=(first,))
+    translating.start()
+    second = service.submit(page())
+    assert second.done.wait(1), "OCR of the next page waited for the previous translation"
+    assert translating.is_alive()
+    release.set()
+    translating.join(2)
+    assert first.error is None and first.segments[0]["english"] == "Hello"
+
+
+def serve(service):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ocr_service.make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def request(server, method, path, body=None):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    conn.request(method, path, body=body)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_translate_endpoint_returns_rendered_page_and_segments():
+    service = ocr_service.OCRService(batch_size=2, max_wait_ms=10, reader=FakeReader())
+    server = serve(service)
+    try:
+        ok, png = cv2.imencode(".png", page())
+        status, reply = request(server, "POST", "/translate", png.tobytes())
+        assert status == 200
+        assert reply["segments"][0]["original"] == "سلام"
+        assert reply["segments"][0]["english"] == "Hello"
+        assert set(reply["timings_ms"]) == set(ocr_service.STAGES)
+        rendered = cv2.imdecode(np.frombuffer(base64.b64decode(reply["image_png"]), np.uint8), cv2.IMREAD_COLOR)
+        assert rendered.shape == (80, 160, 3)
+
+        status, stats = request(server, "GET", "/stats")
+        assert status == 200 and stats["requests"] == 1 and stats["errors"] == 0
+        assert stats["stages_ms"]["translate_render"]["p50"] is not None
+
+        assert request(server, "POST", "/translate", b"not an image")[0] == 400
+    finally:
+        server.shutdown()
+
+
+def test_ocr_failure_is_reported_per_request():
+    service = ocr_service.OCRService(batch_size=1, max_wait_ms=0, reader=FakeReader(fail=True))
+    server = serve(service)
+    try:
+        ok, png = cv2.imencode(".png", page())
+        status, reply = request(server, "POST", "/translate", png.tobytes())
+        assert status == 500 and "reader failed" in reply["error"]
+        assert service.stats()["errors"] == 1
+    finally:
+        server.shutdown()
@@ -0,0 +1,303 @@
+import asyncio
+import time
+
+import numpy as np
+
+from assistant.audio import AudioRingBuffer, CHUNK_FRAMES, SAMPLE_RATE
+from assistant.cache import ResponseCache
+from assistant.memory import ConversationMemory
+from assistant.metrics import MetricsRecorder
+from assistant.pipeline import VoiceAssistant
+from assistant.stubs import StubLLM, StubTTS
+from assistant.vad import EndpointResult
+
+
+SILENCE = bytes(CHUNK_FRAMES * 2)
+TONE = (8000 * np.sin(2 * np.pi * 200 * np.arange(CHUNK_FRAMES) / SAMPLE_RATE)).astype(np.int16).tobytes()
+
+
+class SilentRecognizer:
+    def AcceptWaveform(self, data):
+        return False
+
+    def PartialResult(self):
+        return '{"partial": ""}'
+
+    def Result(self):
+        return '{"text": ""}'
+
+    def FinalResult(self):
+        return '{"text": ""}'
+
+
+class FakePlayer:
+    sample_rate = 24000
+    channels = 1
+
+    def __init__(self):
+        self.stops = 0
+
+    def stop(self):
+        self.stops += 1
+
+    async def play(self, clip):
+        return True
+
+
+def run_recognition(chunks, in_flight, **kwargs):
+    kwargs.setdefault("barge_in_on_speech", True)
+    player = FakePlayer()
+    assistant = VoiceAssistant(SilentRecognizer(), None, None, None, player, None, **kwargs)
+
+    async def main():
+        assistant.ring = AudioRingBuffer(asyncio.get_running_loop())
+        assistant.questions = asyncio.Queue()
+        assistant.answers = asyncio.Queue()
+        assistant.clips = asyncio.Queue()
+        assistant._in_flight = in_flight
+        assistant.answers.put_nowait((0, 1, 1, "An answer being spoken.", None))
+        for chunk in chunks:
+            assistant.ring.push(chunk)
+        assistant.ring.close()
+        await assistant._recognize_loop()
+
+    asyncio.run(main())
+    return assistant, player
+
+
+def test_speech_onset_interrupts_answer_in_flight():
+    assistant, player = run_recognition([SILENCE, SILENCE, TONE, TONE, SILENCE], in_flight=1)
+    assert player.stops == 1
+    assert assistant._epoch == 1
+    assert assistant._in_flight == 0
+    assert assistant.answers.empty()
+
+
+def test_speech_onset_without_answer_does_nothing():
+    assistant, player = run_recognition([SILENCE, TONE, SILENCE], in_flight=0)
+    assert player.stops == 0
+    assert assistant._epoch == 0
+
+
+def test_onset_barge_in_can_be_disabled():
+    assistant, player = run_recognition([SILENCE, TONE, TONE, SILENCE], in_flight=1, barge_in_on_speech=False)
+    assert player.stops == 0
+    assert assistant._in_flight == 1
+    assert not assistant.answers.empty()
+
+
+def test_onset_barge_in_is_off_by_default():
+    assistant = VoiceAssistant(SilentRecognizer(), None, None, None, FakePlayer(), None)
+    assert assistant.barge_in_on_speech is False
+
+
+def test_silence_never_interrupts():
+    assistant, player = run_recognition([SILENCE] * 4, in_flight=1)
+    assert player.stops == 0
+    assert assistant._epoch == 0
+
+
+def ask_with_cache(memory):
+    cache = ResponseCache()
+    cache.store("can you give me an example", "The cat sleeps.", ["The cat sleeps."], [b"clip"])
+    llm = StubLLM("A fresh example.", first_token_delay=0, token_delay=0)
+    assistant = VoiceAssistant(SilentRecognizer(), None, llm, None, FakePlayer(), None, memory=memory, cache=cache)
+
+    async def main():
+        assistant.questions = asyncio.Queue()
+        assistant.answers = asyncio.Queue()
+        assistant.questions.put_nowait((0, 1, "Can you give me an example?"))
+        task = asyncio.ensure_future(assistant._llm_loop())
+        while assistant.answers.qsize() < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        answers = []
+        while not assistant.answers.empty():
+            answers.append(assistant.answers.get_nowait())
+        return answers
+
+    return asyncio.run(main()), cache, llm, assistant
+
+
+def test_cached_answer_replayed_without_history():
+    answers, cache, llm, _ = ask_with_cache(ConversationMemory())
+    assert cache.hits == 1
+    assert llm.requests == []
+    assert answers[0][3:] == ("The cat sleeps.", b"clip")
+
+
+def test_cache_skipped_once_memory_has_history():
+    memory = ConversationMemory()
+    memory.add_turn("What is a noun?", "A noun names a thing.")
+    answers, cache, llm, assistant = ask_with_cache(memory)
+    assert cache.hits == cache.misses == 0
+    assert len(llm.requests) == 1
+    assert answers[0][3] == "A fresh example."
+    assert assistant._recording == {}
+
+
+class RecordingPlayer(FakePlayer):
+    def __init__(self):
+        super().__init__()
+        self.played = []
+
+    async def play(self, clip):
+        self.played.append(clip)
+        return True
+
+
+def hear(*utterances, recognizing=False):
+    """Feed each utterance (a list of recognizer segments) and return the questions submitted."""
+    player = RecordingPlayer()
+    assistant = VoiceAssistant(SilentRecognizer(), None, None, None, player, "ding")
+    assistant.is_recognizing = recognizing
+
+    async def main():
+        assistant.questions = asyncio.Queue()
+        for segments in utterances:
+            for i, text in enumerate(segments):
+                assistant._handle_result({"text": text}, utterance_ended=i == len(segments) - 1)
+        await asyncio.sleep(0)
+        questions = []
+        while not assistant.questions.empty():
+            questions.append(assistant.questions.get_nowait()[2])
+        return questions
+
+    return asyncio.run(main()), assistant, player
+
+
+def test_wake_word_and_question_in_one_breath():
+    questions, assistant, player = hear(["start when does the race start tomorrow"])
+    assert questions == ["when does the race start tomorrow"]
+    assert player.played == ["ding"]
+    assert not assistant.is_recognizing
+
+
+def test_start_inside_a_question_after_waking_is_kept():
+    questions, _, _ = hear(["start"], ["when does the race start tomorrow"])
+    assert questions == ["when does the race start tomorrow"]
+
+
+def test_end_inside_a_question_is_kept():
+    questions, _, player = hear(["how does the story end"], recognizing=True)
+    assert questions == ["how does the story end"]
+    assert player.played == []
+    questions, _, _ = hear(["what happens at the end of the book"], recognizing=True)
+    assert questions == ["what happens at the end of the book"]
+
+
+def test_end_keyword_said_after_the_question_is_stripped():
+    questions, assistant, player = hear(["what is a noun", "end"], recognizing=True)
+    assert questions == ["what is a noun"]
+    assert player.played == ["ding"]
+    assert not assistant.is_recognizing
+
+
+def test_end_alone_stops_recognizing_without_a_question():
+    questions, assistant, _ = hear(["end"], recognizing=True)
+    assert questions == []
+    assert not assistant.is_recognizing
+
+
+def test_spotted_wake_word_is_stripped_from_the_replayed_utterance():
+    class Spotter(SilentRecognizer):
+        def FinalResult(self):
+            return '{"text": "start"}'
+
+    class Full(SilentRecognizer):
+        def FinalResult(self):
+            return '{"text": "start when does the race start"}'
+
+    assistant = VoiceAssistant(Full(), None, None, None, RecordingPlayer(), None, spotter=Spotter())
+
+    async def main():
+        assistant.questions = asyncio.Queue()
+        await assistant._spot(EndpointResult(TONE, started=True, ended=True))
+        return assistant.questions.get_nowait()[2]
+
+    assert asyncio.run(main()) == "when does the race start"
+
+
+async def until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class FailingLLM:
+    async def stream(self, messages):
+        yield "Half an"
+        raise ConnectionError("stream reset")
+
+
+class ListLog:
+    def __init__(self):
+        self.rows = []
+
+    def log(self, kind, **fields):
+        self.rows.append(dict(fields, kind=kind))
+
+
+def test_failed_answer_is_logged_with_its_error_and_kept_out_of_latency():
+    metrics = MetricsRecorder(summary_every=0)
+    log = ListLog()
+    assistant = VoiceAssistant(
+        SilentRecognizer(), None, FailingLLM(), None, FakePlayer(), None, metrics=metrics, session_log=log
+    )
+
+    async def main():
+        assistant.questions = asyncio.Queue()
+        assistant.answers = asyncio.Queue()
+        assistant.clips = asyncio.Queue()
+        tasks = [asyncio.ensure_future(loop()) for loop in (assistant._llm_loop, assistant._tts_loop, assistant._playback_loop)]
+        assistant._speech_end_at = time.monotonic()
+        assistant.is_recognizing = True
+        assistant._submit("what is a noun")
+        await until(lambda: log.rows)
+        for task in tasks:
+            task.cancel()
+
+    asyncio.run(main())
+    (row,) = log.rows
+    assert row["question"] == "what is a noun"
+    assert row["error"] == "ConnectionError('stream reset')"
+    assert row["interrupted"] is False
+    assert metrics.failed == 1
+    assert metrics.finished == 0
+    assert metrics.summary() == {}
+    assert 'status="failed"} 1' in metrics.prometheus_text()
+
+
+def test_repeated_question_hits_the_cache_with_history():
+    memory = ConversationMemory()
+    memory.add_turn("Hello, can you help me practise?", "Of course.")
+    cache = ResponseCache()
+    llm = StubLLM("A noun names a thing.", first_token_delay=0, token_delay=0)
+    log = ListLog()
+    assistant = VoiceAssistant(
+        SilentRecognizer(), None, llm, StubTTS(synth_delay=0), FakePlayer(), None,
+        memory=memory, cache=cache, session_log=log,
+    )
+
+    async def ask(question):
+        assistant.is_recognizing = True
+        assistant._submit(question)
+        await until(lambda: len(log.rows) == assistant.turns)
+
+    async def main():
+        assistant.questions = asyncio.Queue()
+        assistant.answers = asyncio.Queue()
+        assistant.clips = asyncio.Queue()
+        tasks = [asyncio.ensure_future(loop()) for loop in (assistant._llm_loop, assistant._tts_loop, assistant._playback_loop)]
+        await ask("What is a noun?")
+        await until(lambda: len(cache))
+        await ask("Can you give me an example?")
+        await ask("What is a noun?")
+        for task in tasks:
+            task.cancel()
+
+    asyncio.run(main())
+    assert [row["cached"] for row in log.rows] == [False, False, True]
+    assert len(llm.requests) == 2
+    assert cache.hits == 1
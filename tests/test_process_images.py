@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+Image = pytest.importorskip("PIL.Image")
+
+import process_images  # noqa: E402
+
+
+FA_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+
+
+class HeightReader:
+    """Reads each page's pixel height back as a Persian word, so pages can be told apart."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def readtext(self, bgr):
+        h, w = bgr.shape[:2]
+        self.shapes.append((h, w))
+        box = [[w // 4, h // 3], [3 * w // 4, h // 3], [3 * w // 4, 2 * h // 3], [w // 4, 2 * h // 3]]
+        return [(box, "صفحه " + str(h).translate(FA_DIGITS), 0.9), (box, "latin only", 0.8)]
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    reader = HeightReader()
+    monkeypatch.setattr(process_images, "get_reader", lambda: reader)
+    monkeypatch.setattr(process_images, "translate_fa_to_en", lambda text: text.replace("صفحه", "page"))
+    return reader
+
+
+def write_tiff(path, heights, dpi=150):
+    pages = [Image.new("RGB", (120, h), (255, 255, 255)) for h in heights]
+    pages[0].save(path, save_all=True, append_images=pages[1:], dpi=(dpi, dpi))
+
+
+def pdf_page_count(path):
+    fitz = pytest.importorskip("fitz")
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def test_tiff_pages_are_read_one_by_one_with_their_dpi(tmp_path):
+    path = str(tmp_path / "scan.tif")
+    write_tiff(path, [80, 100, 120])
+    assert process_images.is_multipage_document(path)
+    pages = list(process_images.iter_tiff_pages(path))
+    assert [bgr.shape for bgr, _ in pages] == [(80, 120, 3), (100, 120, 3), (120, 120, 3)]
+    assert [dpi for _, dpi in pages] == [150.0] * 3
+
+
+def test_single_page_tiff_is_an_image(tmp_path):
+    path = str(tmp_path / "one.tif")
+    write_tiff(path, [80])
+    assert not process_images.is_multipage_document(path)
+
+
+def test_multipage_tiff_transcript_and_pdf(tmp_path, reader):
+    path = str(tmp_path / "scan.tif")
+    out_pdf, out_json = str(tmp_path / "scan.pdf"), str(tmp_path / "scan.json")
+    write_tiff(path, [80, 100, 120])
+
+    assert process_images.process_document(path, out_pdf, out_json) == 3
+
+    with open(out_json, encoding="utf-8") as f:
+        transcript = json.load(f)
+    assert [p["page"] for p in transcript] == [1, 2, 3]
+    for entry, height in zip(transcript, [80, 100, 120]):
+        (segment,) = entry["segments"]  # the Latin-only result is left alone
+        assert segment["english"] == f"page {height}"
+        assert segment["lang"] == "fa"
+        assert set(segment) == {"bbox", "lang", "original", "english", "confidence"}
+    assert pdf_page_count(out_pdf) == 3
+
+
+def test_pdf_pages_are_rendered_at_the_requested_dpi(tmp_path, reader):
+    fitz = pytest.importorskip("fitz")
+    path = str(tmp_path / "doc.pdf")
+    with fitz.open() as doc:
+        for height in (144, 216, 288, 360):
+            doc.new_page(width=144, height=height)
+        doc.save(path)
+
+    pages = list(process_images.iter_pdf_pages(path, dpi=36))
+    assert [bgr.shape for bgr, _ in pages] == [(72, 72, 3), (108, 72, 3), (144, 72, 3), (180, 72, 3)]
+    assert all(dpi == 36.0 for _, dpi in pages)
+
+    out_pdf, out_json = str(tmp_path / "out.pdf"), str(tmp_path / "out.json")
+    assert process_images.process_document(path, out_pdf, out_json, dpi=36) == 4
+    with open(out_json, encoding="utf-8") as f:
+        transcript = json.load(f)
+    assert [p["segments"][0]["english"] for p in transcript] == ["page 72", "page 108", "page 144", "page 180"]
+    assert reader.shapes == [(72, 72), (108, 72), (144, 72), (180, 72)]
+    assert pdf_page_count(out_pdf) == 4
@@ -0,0 +1,48 @@
+from assistant.sentences import SentenceChunker
+
+
+def stream(chunker, *deltas):
+    out = []
+    for delta in deltas:
+        out.extend(chunker.feed(delta))
+    return out
+
+
+def test_sentences_are_emitted_as_soon_as_they_end():
+    chunker = SentenceChunker()
+    assert chunker.feed("A noun names a thing. A verb") == ["A noun names a thing."]
+    assert chunker.feed(" names an action!\nAdjectives describe") == ["A verb names an action!"]
+    assert chunker.flush() == ["Adjectives describe"]
+    assert chunker.flush() == []
+
+
+def test_abbreviations_do_not_end_a_sentence():
+    chunker = SentenceChunker()
+    out = stream(chunker, "Ask Dr. Smith about it, e.g. ", "after class. Mr. ", "Jones agrees. ")
+    assert out == ["Ask Dr. Smith about it, e.g. after class.", "Mr. Jones agrees."]
+
+
+def test_decimal_split_across_deltas_stays_whole():
+    chunker = SentenceChunker()
+    assert chunker.feed("The score went up by 3.") == []
+    assert chunker.feed("5 points this week. Then") == ["The score went up by 3.5 points this week."]
+    assert chunker.flush() == ["Then"]
+
+
+def test_trailing_punctuation_waits_for_the_next_delta():
+    chunker = SentenceChunker()
+    assert chunker.feed("That is the whole rule.") == []
+    assert chunker.feed(" Next,") == ["That is the whole rule."]
+
+
+def test_short_fragments_are_held_back():
+    chunker = SentenceChunker()
+    assert chunker.feed("Yes. ") == []
+    assert chunker.feed("No. ") == []
+    assert chunker.feed("That is exactly right. ") == ["Yes. No. That is exactly right."]
+    assert stream(SentenceChunker(min_chars=3), "Yes. ", "No. ") == ["Yes.", "No."]
+
+
+def test_closing_quotes_stay_with_their_sentence():
+    chunker = SentenceChunker()
+    assert chunker.feed('She said "stop right there." Then') == ['She said "stop right there."']
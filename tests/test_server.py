@@ -0,0 +1,145 @@
+import asyncio
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from assistant.audio import SAMPLE_RATE
+from assistant.loadtest import run_load, run_session
+from assistant.recognition import recognize_chunk
+from assistant.server import RecognitionServer
+
+
+def utterance(seconds, silence=0.5):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = 3000 * np.sin(2 * np.pi * 180 * t)
+    quiet = np.zeros(int(silence * SAMPLE_RATE))
+    return np.concatenate([quiet, tone, quiet]).astype(np.int16).tobytes()
+
+
+class ByteCountingRecognizer:
+    """Transcribes an utterance as the number of bytes it was fed."""
+
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self, delay_per_second=0.0):
+        with self.lock:
+            ByteCountingRecognizer.created += 1
+        self.delay_per_second = delay_per_second
+        self.fed = 0
+
+    def AcceptWaveform(self, data):
+        time.sleep(self.delay_per_second * len(data) / (2.0 * SAMPLE_RATE))
+        self.fed += len(data)
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": str(self.fed)})
+
+    def Result(self):
+        return json.dumps({"text": str(self.fed)})
+
+    def FinalResult(self):
+        text, self.fed = str(self.fed), 0
+        return json.dumps({"text": text})
+
+
+async def with_server(server, client):
+    listener = await asyncio.start_server(server._handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        async with listener:
+            return await client(port)
+    finally:
+        server.pool.shutdown()
+
+
+class RecordingRecognizer:
+    def __init__(self, result='{"text": "hi"}', accepts=False):
+        self.calls = []
+        self.result = result
+        self.accepts = accepts
+
+    def AcceptWaveform(self, data):
+        self.calls.append(("accept", len(data)))
+        return self.accepts
+
+    def Result(self):
+        self.calls.append(("result",))
+        return self.result
+
+    def PartialResult(self):
+        self.calls.append(("partial",))
+        return '{"partial": "h"}'
+
+    def FinalResult(self):
+        self.calls.append(("final",))
+        return self.result
+
+
+def test_recognize_chunk_paths():
+    rec = RecordingRecognizer()
+    assert recognize_chunk(rec, b"\0\0", False) == {"partial": "h"}
+    rec = RecordingRecognizer(accepts=True)
+    assert recognize_chunk(rec, b"\0\0", False) == {"text": "hi"}
+    rec = RecordingRecognizer()
+    assert recognize_chunk(rec, b"", True) == {"text": "hi"}
+    assert rec.calls == [("final",)]
+    assert recognize_chunk(RecordingRecognizer(result="not json"), b"\0\0", True) == {}
+
+
+def test_sessions_get_their_own_recognizer_and_ordered_transcripts():
+    ByteCountingRecognizer.created = 0
+    utterances = [utterance(0.6), utterance(1.1)]
+    server = RecognitionServer(ByteCountingRecognizer, workers=2, use_vad=False)
+    report = asyncio.run(with_server(server, lambda port: run_load("127.0.0.1", port, utterances, sessions=3, rounds=2)))
+
+    assert report["failed_sessions"] == 0
+    assert report["utterances"] == 3 * 2 * 2
+    assert ByteCountingRecognizer.created == 3
+    assert report["audio_seconds"] == pytest.approx(3 * 2 * (1.6 + 2.1))
+    assert server.sessions == 3 and server.clients == 0
+
+
+def test_vad_skips_silence_and_flush_returns_the_utterance():
+    pcm = utterance(1.0, silence=1.0)
+
+    async def client(port):
+        return await run_session("127.0.0.1", port, [pcm, pcm])
+
+    result = asyncio.run(with_server(RecognitionServer(ByteCountingRecognizer, workers=1), client))
+    assert len(result["transcripts"]) == 2
+    decoded = sum(int(n) for n in result["transcripts"][0].split())
+    assert 2 * SAMPLE_RATE * 1.0 <= decoded < len(pcm)
+    assert result["transcripts"][0] == result["transcripts"][1]
+
+
+def test_slow_decoding_throttles_the_client_without_losing_audio():
+    pcm = utterance(2.0, silence=0)
+    server = RecognitionServer(lambda: ByteCountingRecognizer(delay_per_second=0.05), workers=1, max_pending=2, use_vad=False)
+
+    async def client(port):
+        return await run_session("127.0.0.1", port, [pcm])
+
+    result = asyncio.run(with_server(server, client))
+    assert result["transcripts"] == [str(len(pcm))]
+    assert server.throttled > 0
+
+
+def test_clients_beyond_the_limit_are_turned_away():
+    server = RecognitionServer(ByteCountingRecognizer, max_clients=1, use_vad=False)
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        while server.clients == 0:
+            await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(ConnectionError, match="server busy"):
+                await run_session("127.0.0.1", port, [])
+        finally:
+            writer.close()
+
+    asyncio.run(with_server(server, client))
@@ -0,0 +1,86 @@
+import json
+import os
+import time
+
+from assistant.metrics import MetricsRecorder
+from assistant.session_log import SessionLogger
+
+
+def read_records(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_full_batch_is_written_without_waiting_for_the_interval(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    log = SessionLogger(path, batch_size=3, flush_interval=30)
+    for i in range(4):
+        log.log("turn", turn=i)
+    assert wait_for(lambda: len(read_records(path)) == 3)
+    time.sleep(0.1)
+    assert len(read_records(path)) == 3  # the fourth waits for the next batch
+    log.close()
+    records = read_records(path)
+    assert [r["turn"] for r in records] == [0, 1, 2, 3]
+    assert all(r["event"] == "turn" and "time" in r for r in records)
+
+
+def test_partial_batch_is_flushed_after_the_interval(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    with SessionLogger(path, batch_size=100, flush_interval=0.05) as log:
+        log.log("turn", question="What is a noun?")
+        assert wait_for(lambda: len(read_records(path)) == 1)
+
+
+def test_rotation_keeps_the_configured_backups(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    with SessionLogger(path, max_bytes=300, backups=2, batch_size=1, flush_interval=0.01) as log:
+        for i in range(40):
+            log.log("turn", turn=i, answer="x" * 40)
+    assert os.path.exists(path + ".1") and os.path.exists(path + ".2")
+    assert not os.path.exists(path + ".3")
+    # A file is rotated by the first batch (one record here) that takes it past max_bytes
+    record_bytes = len(json.dumps(read_records(path + ".1")[0])) + 1
+    for name in (path + ".1", path + ".2"):
+        assert 300 <= os.path.getsize(name) < 300 + record_bytes
+    turns = [r["turn"] for name in (path + ".2", path + ".1", path) for r in read_records(name)]
+    assert turns == sorted(turns)
+    assert turns[-1] == 39
+
+
+def test_records_after_close_are_ignored(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    log = SessionLogger(path)
+    log.close()
+    log.log("turn", turn=1)
+    log.close()
+    assert read_records(path) == []
+
+
+def test_metrics_recorder_returns_rows_without_writing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    now = [10.0]
+    metrics = MetricsRecorder(summary_every=0, clock=lambda: now[0])
+    metrics.start_turn(1, speech_end=9.5)
+    metrics.mark(1, "final_transcript")
+    now[0] = 10.4
+    metrics.mark(1, "first_audio")
+    now[0] = 12.0
+    metrics.mark(1, "playback_end")
+    row = metrics.finish(1)
+    assert row["stages_ms"]["time_to_first_audio"] == 900.0
+    assert row["stages_ms"]["turn"] == 2500.0
+    metrics.start_turn(2)
+    metrics.mark(2, "request_sent")
+    assert [r["turn"] for r in metrics.abandon_all()] == [2]
+    assert (metrics.finished, metrics.interrupted) == (1, 1)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from assistant.audio import CHUNK_FRAMES, SAMPLE_RATE
+from assistant.vad import EnergyVAD, Endpointer
+
+
+CHUNK_MS = CHUNK_FRAMES * 1000 // SAMPLE_RATE
+
+
+def tone(seconds, dbfs, freq, start=0):
+    """A sine at ``dbfs`` (RMS relative to full scale), continuing the phase from sample ``start``."""
+    amplitude = 32768 * np.sqrt(2) * 10 ** (dbfs / 20)
+    t = np.arange(start, start + int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+
+def pcm(signal):
+    return np.clip(signal, -32768, 32767).astype(np.int16).tobytes()
+
+
+def feed(endpointer, data):
+    """Feed ``data`` in microphone-sized chunks; return (time ms, result) for every boundary."""
+    events = []
+    step = CHUNK_FRAMES * 2
+    for i in range(0, len(data), step):
+        result = endpointer.process(data[i : i + step])
+        if result.started or result.ended:
+            events.append((i // 2 * 1000 // SAMPLE_RATE, result))
+    return events
+
+
+@pytest.mark.parametrize("hum_db", [-48, -44, -40])
+def test_steady_hum_is_learned_as_noise(hum_db):
+    endpointer = Endpointer()
+    events = feed(endpointer, pcm(tone(10, hum_db, 120)))
+    assert any(r.ended for _, r in events)
+    assert not endpointer.in_speech
+    assert endpointer.vad.noise_db == pytest.approx(hum_db, abs=1.0)
+    # once the floor is learned the hum stays quiet
+    assert not any(r.started for t, r in events if t > 5000)
+
+
+def test_speech_over_hum_is_detected_after_adapting():
+    endpointer = Endpointer()
+    hum = tone(12, -44, 120)
+    feed(endpointer, pcm(hum[: 6 * SAMPLE_RATE]))
+    assert not endpointer.in_speech
+
+    # two seconds of words with short pauses, then four seconds of hum
+    rest = hum[6 * SAMPLE_RATE :].copy()
+    for word in range(4):
+        lo = word * 500 * SAMPLE_RATE // 1000
+        hi = lo + 350 * SAMPLE_RATE // 1000
+        rest[lo:hi] += tone(0.35, -20, 300, start=lo)
+    events = feed(endpointer, pcm(rest))
+    started = [t for t, r in events if r.started]
+    ended = [t for t, r in events if r.ended]
+    assert len(started) == 1 and started[0] < 200
+    assert len(ended) == 1 and 2000 <= ended[0] <= 3000
+
+
+def test_pauses_between_words_keep_the_floor_down():
+    vad = EnergyVAD()
+    quiet = tone(0.2, -70, 120)
+    talk = np.concatenate([np.concatenate((tone(0.5, -25, 300), quiet)) for _ in range(8)])
+    vad.classify(pcm(talk))
+    assert vad.noise_db < -60
+
+
+def test_max_utterance_forces_an_end():
+    # the floor window is longer than the cap, so only the cap can end this
+    endpointer = Endpointer(EnergyVAD(floor_window_ms=60000), max_utterance_ms=2000)
+    events = feed(endpointer, pcm(tone(5, -30, 300)))
+    assert [r.started for _, r in events][:2] == [True, False]
+    first_end = next(t for t, r in events if r.ended)
+    assert 2000 <= first_end <= 2000 + 2 * CHUNK_MS
+
+
+def test_silence_ends_an_utterance_with_trailing_silence():
+    endpointer = Endpointer(hangover_ms=300)
+    events = feed(endpointer, pcm(np.concatenate((tone(1, -25, 300), np.zeros(SAMPLE_RATE)))))
+    assert [(r.started, r.ended) for _, r in events] == [(True, False), (False, True)]
+    assert events[1][1].trailing_silence_ms >= 300